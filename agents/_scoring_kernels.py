@@ -0,0 +1,118 @@
+"""LEFTOVR scoring kernels
+
+Numeric core of RecipeKnowledgeAgent candidate ranking. Takes per-candidate
+arrays (pantry items used, total ingredients, semantic similarity) and
+returns the top_k candidate indices with their scores.
+
+The score loop is JIT-compiled with Numba when it is installed and falls
+back to plain NumPy otherwise:
+    pip install numba
+"""
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+# Filtered-out candidates get this score so they sort last
+_REJECTED = -np.inf
+
+
+def _score_loop(num_used, total_ing, sem_sim, allow_missing):
+    n = num_used.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        missing = total_ing[i] - num_used[i]
+        if missing > allow_missing:
+            out[i] = _REJECTED
+        else:
+            # Base: more leftovers used = better, +1000 if nothing to buy
+            score = num_used[i] * 100.0 - total_ing[i]
+            if missing == 0:
+                score += 1000.0
+            out[i] = score + sem_sim[i] * 50.0
+    return out
+
+
+def _score_numpy(num_used, total_ing, sem_sim, allow_missing):
+    missing = total_ing - num_used
+    out = (num_used * 100.0
+           + np.where(missing == 0, 1000.0, 0.0)
+           - total_ing
+           + sem_sim * 50.0)
+    out[missing > allow_missing] = _REJECTED
+    return out
+
+
+if njit is not None:
+    # Serial on purpose: candidate counts are small, and hybrid_query_async
+    # calls this from several threads, which Numba's default workqueue
+    # threading layer aborts on for parallel=True kernels.
+    # Everything fastmath=True enables except nnan/ninf: the loop writes -inf
+    # (_REJECTED) and callers compare against it
+    _score = njit(cache=True,
+                  fastmath={'nsz', 'arcp', 'contract', 'afn', 'reassoc'})(_score_loop)
+else:
+    _score = _score_numpy
+
+HAS_NUMBA = njit is not None
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first (ties keep input order)."""
+    if k <= 0 or scores.size == 0:
+        return np.empty(0, dtype=np.intp)
+    if scores.size > k:
+        # argpartition picks arbitrarily among ties at the cut, so select by
+        # threshold instead: everything strictly better, then the earliest ties
+        neg = -scores
+        kth = np.partition(neg, k - 1)[k - 1]
+        better = np.flatnonzero(neg < kth)
+        ties = np.flatnonzero(neg == kth)[:k - better.size]
+        part = np.sort(np.concatenate((better, ties)))
+        return part[np.argsort(neg[part], kind='stable')]
+    return np.argsort(-scores, kind='stable')
+
+
+def score_candidates(
+    num_used: np.ndarray,
+    total_ing: np.ndarray,
+    allow_missing: int,
+    top_k: int,
+    sem_sim: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score candidates and keep the best top_k.
+
+    Args:
+        num_used: Pantry items each candidate uses
+        total_ing: Total ingredients per candidate
+        allow_missing: Drop candidates missing more ingredients than this
+        top_k: Maximum results
+        sem_sim: Optional semantic similarity per candidate (adds sim * 50)
+
+    Returns:
+        (indices into the input arrays, scores) - best first
+    """
+    num_used = np.ascontiguousarray(num_used, dtype=np.int32)
+    total_ing = np.ascontiguousarray(total_ing, dtype=np.int32)
+    if sem_sim is None:
+        sem_sim = np.zeros(num_used.shape[0], dtype=np.float64)
+    else:
+        sem_sim = np.ascontiguousarray(sem_sim, dtype=np.float64)
+
+    scores = _score(num_used, total_ing, sem_sim, int(allow_missing))
+    valid = np.flatnonzero(scores != _REJECTED)
+    top = valid[top_k_indices(scores[valid], top_k)]
+    return top, scores[top]
+
+
+# Pay the JIT compile (or cache load) once at import, not on the first query
+if HAS_NUMBA:
+    score_candidates(np.ones(2, dtype=np.int32), np.full(2, 2, dtype=np.int32), 1, 1)
@@ -8,7 +8,8 @@ for easier testing and development.
 
 import os
 import sys
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
 from dotenv import load_dotenv
@@ -41,6 +42,40 @@ def normalize_food_id(name: str) -> str:
     return singular_name.lower().strip().replace(' ', '-')
 
 
+@lru_cache(maxsize=512)
+def parse_add_query(user_message: str) -> Optional[Tuple[Tuple[str, int], ...]]:
+    """
+    Parse an "add"/"have" message into (name, quantity) pairs.
+
+    Pure function of the message text, so repeated queries are served from
+    the cache. Returns None when the message is not an add request.
+
+    Args:
+        user_message: Natural language query
+
+    Returns:
+        Tuple of (item_name, quantity) pairs, or None
+    """
+    message_lower = user_message.lower()
+    if "add" not in message_lower and "have" not in message_lower:
+        return None
+
+    # Look for numbers followed by words (very simple parsing for demo)
+    words = user_message.split()
+    to_add = []
+    i = 0
+    while i < len(words):
+        word = words[i]
+        if word.isdigit():
+            quantity = int(word)
+            if i + 1 < len(words):
+                to_add.append((words[i + 1].strip(',.'), quantity))
+                i += 2
+                continue
+        i += 1
+    return tuple(to_add)
+
+
 class PantryAgent:
     """
     Simplified Pantry Agent - Direct database access (no MCP server needed)
@@ -49,22 +84,31 @@ class PantryAgent:
     Perfect for development and when MCP server is not needed.
     """
 
-    def __init__(self, name: str = "Pantry Manager"):
+    def __init__(self, name: str = "Pantry Manager", db_path: Optional[str] = None):
         self.name = name
-        self.db = PantryDatabase()
-        self._connected = True
+        self.db_path = db_path  # None = default ~/.leftovr/pantry.db
+        self._db: Optional[PantryDatabase] = None  # opened on first use
         print(f"✅ Pantry Agent initialized (Direct DB mode)")
 
+    @property
+    def db(self) -> PantryDatabase:
+        """Pantry database, opened lazily on first access"""
+        if self._db is None:
+            self._db = PantryDatabase(self.db_path)
+        return self._db
+
+    @property
+    def _connected(self) -> bool:
+        return self._db is not None
+
     async def ensure_connected(self):
-        """Compatibility method - already connected to DB"""
-        if not self._connected:
-            self.db = PantryDatabase()
-            self._connected = True
+        """Compatibility method - opens the DB now instead of on first use"""
+        self.db
         return True
 
     async def disconnect(self):
         """Compatibility method for cleanup"""
-        self._connected = False
+        self._db = None
 
     def get_inventory(self) -> List[Dict[str, Any]]:
         """
@@ -149,6 +193,37 @@ class PantryAgent:
             "expire_date": expire_date
         }
 
+    def bulk_add_ingredients(self, rows: Iterable[Sequence[Any]]) -> List[Dict[str, Any]]:
+        """
+        Add or update many ingredients in a single database transaction.
+        
+        Args:
+            rows: (ingredient_name, quantity) or
+                  (ingredient_name, quantity, expire_date) tuples
+            
+        Returns:
+            List of dicts with the added/updated item info, in input order
+        """
+        default_expire = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
+        
+        added = []
+        for row in rows:
+            ingredient_name, quantity = row[0], row[1]
+            expire_date = (row[2] if len(row) > 2 else None) or default_expire
+            added.append({
+                "id": normalize_food_id(ingredient_name),
+                "name": ingredient_name,
+                "quantity": quantity,
+                "expire_date": expire_date
+            })
+        
+        if added:
+            self.db.add_food_items(
+                (item["id"], item["name"], item["quantity"], item["expire_date"])
+                for item in added
+            )
+        return added
+
     def remove_ingredient(self, ingredient_id: str) -> Dict[str, Any]:
         """
         Remove an ingredient from the pantry.
@@ -206,30 +281,11 @@ class PantryAgent:
         Returns:
             Response dict with items or error
         """
-        message_lower = user_message.lower()
+        to_add = parse_add_query(user_message)
         
-        # Simple parsing for testing
-        if "add" in message_lower or "have" in message_lower:
-            # Extract items (very simple parsing for demo)
-            words = user_message.split()
-            items_added = []
-            
-            # Look for numbers followed by words
-            i = 0
-            while i < len(words):
-                word = words[i]
-                if word.isdigit():
-                    quantity = int(word)
-                    if i + 1 < len(words):
-                        item_name = words[i + 1].strip(',.')
-                        result = self.add_or_update_ingredient(
-                            ingredient_name=item_name,
-                            quantity=quantity
-                        )
-                        items_added.append(result)
-                        i += 2
-                        continue
-                i += 1
+        if to_add is not None:
+            # One transaction for everything in the message
+            items_added = self.bulk_add_ingredients(to_add)
             
             if items_added:
                 return {
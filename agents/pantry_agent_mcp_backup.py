@@ -21,6 +21,7 @@ import subprocess
 import sys
 import threading
 import queue
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 from datetime import date, datetime, timedelta
 from pathlib import Path
@@ -37,6 +38,33 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY") or os.getenv("OPEN_AI_API_KEY")
 p = inflect.engine()
 
 
+# Common non-food items to reject
+NON_FOOD_KEYWORDS = (
+    # Electronics
+    "laptop", "computer", "phone", "tablet", "ipad", "iphone", "keyboard", "mouse",
+    "charger", "cable", "headphone", "speaker", "tv", "television", "monitor",
+    # Clothing
+    "shirt", "pants", "shoe", "sock", "jacket", "coat", "dress", "skirt", "hat",
+    "glove", "scarf", "belt", "tie",
+    # Other items
+    "book", "pen", "pencil", "paper", "notebook", "bag", "wallet", "key", "car",
+    "bike", "furniture", "chair", "table", "bed", "couch", "lamp", "pillow",
+    "towel", "soap", "shampoo", "toothbrush", "medicine", "pill", "vitamin"
+)
+
+
+@lru_cache(maxsize=2048)
+def _is_food_name(item_lower: str) -> bool:
+    """Heuristic food check on a lowercased, stripped item name (memoized)."""
+    # Check if any non-food keyword is in the item name
+    if any(keyword in item_lower for keyword in NON_FOOD_KEYWORDS):
+        return False
+
+    # If it passes the non-food check, assume it's food
+    # (The LLM will do more sophisticated validation)
+    return True
+
+
 def normalize_food_id(name: str) -> str:
     """
     Normalize a food name for deterministic IDs:
@@ -996,30 +1024,8 @@ class PantryAgent:
         Returns:
             True if likely food, False otherwise
         """
-        item_lower = item_name.lower().strip()
-
-        # Common non-food items to reject
-        non_food_keywords = [
-            # Electronics
-            "laptop", "computer", "phone", "tablet", "ipad", "iphone", "keyboard", "mouse",
-            "charger", "cable", "headphone", "speaker", "tv", "television", "monitor",
-            # Clothing
-            "shirt", "pants", "shoe", "sock", "jacket", "coat", "dress", "skirt", "hat",
-            "glove", "scarf", "belt", "tie",
-            # Other items
-            "book", "pen", "pencil", "paper", "notebook", "bag", "wallet", "key", "car",
-            "bike", "furniture", "chair", "table", "bed", "couch", "lamp", "pillow",
-            "towel", "soap", "shampoo", "toothbrush", "medicine", "pill", "vitamin"
-        ]
-
-        # Check if any non-food keyword is in the item name
-        for keyword in non_food_keywords:
-            if keyword in item_lower:
-                return False
-
-        # If it passes the non-food check, assume it's food
-        # (The LLM will do more sophisticated validation)
-        return True
+        # Cached on the normalized name; the check doesn't depend on self
+        return _is_food_name(item_name.lower().strip())
 
     def _simple_quantity_check(self, user_query: str) -> Dict[str, Any]:
         """
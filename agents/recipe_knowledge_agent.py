@@ -12,10 +12,17 @@ Usage:
 """
 from __future__ import annotations
 
+import asyncio
 import json
+import mmap
 import os
 import re
-from typing import List, Dict, Tuple, Optional, Iterable, Set, Any
+from collections.abc import Mapping
+from typing import List, Dict, Tuple, Optional, Iterable, Iterator, Set, Any, FrozenSet
+
+import numpy as np
+
+from agents._scoring_kernels import score_candidates, top_k_indices
 
 try:
     from pinecone import Pinecone
@@ -27,7 +34,17 @@ try:
 except Exception:
     SentenceTransformer = None
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 
+# Ingest scripts write "id" as the first key of every metadata line
+_LINE_ID_RE = re.compile(rb'\{\s*"id"\s*:\s*"?(-?\d+)')
+# Non-empty "directions" value (list or string), checked without decoding the line
+_HAS_DIRECTIONS_RE = re.compile(rb'"directions"\s*:\s*(?:\[\s*[^\s\]]|"[^"])')
 _UNIT_QTY_RE = re.compile(r'(^|\s)\d+\/?\d*\s*(cups?|cup|tbsp|tbs|tbsp\.|tsp|grams?|g|kg|oz|ounces?)', re.I)
 
 
@@ -43,10 +60,109 @@ def _normalize_token(tok: str) -> str:
     return s
 
 
+class _LazyDirections(Mapping):
+    """
+    recipe_id -> directions, decoded on access from a memory-mapped
+    recipe_metadata.jsonl. Only line offsets are held in memory.
+
+    Keys are the recipes that have directions (as the eager dict had);
+    record() still reaches every line in the file.
+    """
+
+    def __init__(self, mm: mmap.mmap, ids: np.ndarray, starts: np.ndarray,
+                 ends: np.ndarray, has_dirs: np.ndarray) -> None:
+        order = np.argsort(ids, kind='stable')
+        self._mm = mm
+        self._ids = ids[order]
+        self._starts = starts[order]
+        self._ends = ends[order]
+        self._has_dirs = has_dirs[order]
+        self._dir_ids = self._ids[self._has_dirs]
+
+    @classmethod
+    def from_file(cls, path: str) -> '_LazyDirections':
+        with open(path, 'rb') as fh:
+            if os.fstat(fh.fileno()).st_size == 0:
+                return cls(None, *(np.empty(0, dtype=np.int64) for _ in range(3)),
+                           np.empty(0, dtype=bool))
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+        ids: List[int] = []
+        starts: List[int] = []
+        ends: List[int] = []
+        has_dirs: List[bool] = []
+        pos = 0
+        for line in iter(mm.readline, b''):
+            end = pos + len(line)
+            m = _LINE_ID_RE.match(line)
+            if m:
+                rid = int(m.group(1))
+                has = _HAS_DIRECTIONS_RE.search(line) is not None
+            elif line.strip():
+                obj = _json_loads(line)
+                rid = int(obj['id'])
+                has = bool(obj.get('directions'))
+            else:
+                rid = None
+            if rid is not None:
+                ids.append(rid)
+                starts.append(pos)
+                ends.append(end)
+                has_dirs.append(has)
+            pos = end
+
+        return cls(mm, np.asarray(ids, dtype=np.int64),
+                   np.asarray(starts, dtype=np.int64), np.asarray(ends, dtype=np.int64),
+                   np.asarray(has_dirs, dtype=bool))
+
+    def _find(self, rid: int) -> int:
+        i = int(np.searchsorted(self._ids, rid))
+        if i < len(self._ids) and self._ids[i] == rid:
+            return i
+        raise KeyError(rid)
+
+    def record(self, rid: int) -> Optional[Dict[str, Any]]:
+        """Full decoded metadata line for a recipe, or None if absent."""
+        try:
+            i = self._find(rid)
+        except KeyError:
+            return None
+        return _json_loads(self._mm[self._starts[i]:self._ends[i]])
+
+    def has_record(self, rid: int) -> bool:
+        """Whether the file has a line for a recipe, without decoding it."""
+        i = int(np.searchsorted(self._ids, rid))
+        return i < len(self._ids) and self._ids[i] == rid
+
+    def __getitem__(self, rid: int) -> List[str]:
+        i = self._find(rid)
+        if not self._has_dirs[i]:
+            raise KeyError(rid)
+        return _json_loads(self._mm[self._starts[i]:self._ends[i]])['directions']
+
+    def __contains__(self, rid: object) -> bool:
+        try:
+            return bool(self._has_dirs[self._find(rid)])
+        except (KeyError, TypeError):
+            return False
+
+    def __iter__(self) -> Iterator[int]:
+        return (int(rid) for rid in self._dir_ids)
+
+    def __len__(self) -> int:
+        return len(self._dir_ids)
+
+
 class RecipeKnowledgeAgent:
     def __init__(self, data_dir: str = 'data') -> None:
         self.data_dir = data_dir
-        self.directions_cache: Dict[int, List[str]] = {}
+        self.directions_cache: Mapping = {}  # recipe_id -> directions
+        self.ing_index: Dict[str, np.ndarray] = {}  # ingredient -> int32 recipe ids
+        self.recipe_ing_counts: Optional[np.ndarray] = None  # recipe id -> #ingredients
+        # Reverse of ing_index (CSR): recipe id -> token ids, and token id -> name
+        self._ing_tokens: List[str] = []
+        self._recipe_tok: Optional[np.ndarray] = None
+        self._recipe_tok_start: Optional[np.ndarray] = None
         self.pinecone_index = None
         self.embed_model = None
         self.embed_dim = None
@@ -58,6 +174,9 @@ class RecipeKnowledgeAgent:
         OPTIONAL: Load recipe directions from local JSONL file.
         Only needed if you want cooking instructions (not stored in Pinecone).
 
+        The file is memory-mapped and only line offsets are indexed up front;
+        each recipe's directions are decoded when first looked up.
+
         Args:
             path: Path to recipe_metadata.jsonl file
         """
@@ -66,18 +185,55 @@ class RecipeKnowledgeAgent:
             print(f"⚠️  Directions file not found: {path}")
             return
 
-        self.directions_cache = {}
+        self.directions_cache = _LazyDirections.from_file(path)
+
+        print(f"✅ Indexed directions for {len(self.directions_cache):,} recipes")
+
+    def load_ingredient_index(self, path: Optional[str] = None) -> None:
+        """
+        OPTIONAL: Load the inverted ingredient index written at ingest time.
+        When loaded, pantry_candidates() counts matches locally from the
+        postings instead of scanning Pinecone results recipe by recipe.
+
+        Args:
+            path: Path to ingredient_index.json ({ingredient: [recipe_id, ...]})
+        """
+        path = path or os.path.join(self.data_dir, 'ingredient_index.json')
+        if not os.path.exists(path):
+            print(f"⚠️  Ingredient index not found: {path}")
+            return
+
         with open(path, 'r', encoding='utf8') as fh:
-            for line in fh:
-                if not line.strip():
-                    continue
-                obj = json.loads(line)
-                rid = int(obj['id'])
-                directions = obj.get('directions', [])
-                if directions:
-                    self.directions_cache[rid] = directions
+            raw = json.load(fh)
 
-        print(f"✅ Loaded directions for {len(self.directions_cache):,} recipes")
+        # Postings as sorted, de-duplicated int32 arrays (4 bytes per entry)
+        self.ing_index = {
+            tok: np.unique(np.asarray(ids, dtype=np.int32))
+            for tok, ids in raw.items() if ids
+        }
+
+        # Every recipe appears once in the posting of each of its ingredients,
+        # so counting ids over all postings gives its total ingredient count.
+        if self.ing_index:
+            self._ing_tokens = list(self.ing_index)
+            postings = list(self.ing_index.values())
+            all_ids = np.concatenate(postings)
+            self.recipe_ing_counts = np.bincount(all_ids).astype(np.int32)
+
+            # Group token ids by recipe so missing lists come from the same
+            # tokens the scores were counted from
+            tok_of = np.repeat(np.arange(len(postings), dtype=np.int32),
+                               [len(ids) for ids in postings])
+            self._recipe_tok = tok_of[np.argsort(all_ids, kind='stable')]
+            self._recipe_tok_start = np.concatenate(
+                ([0], np.cumsum(self.recipe_ing_counts, dtype=np.int64))
+            )
+        else:
+            self.recipe_ing_counts = None
+            self._ing_tokens = []
+            self._recipe_tok = self._recipe_tok_start = None
+
+        print(f"✅ Loaded ingredient index for {len(self.ing_index):,} ingredients")
 
     def setup_pinecone(self, embed_model_name: str = 'all-MiniLM-L6-v2') -> None:
         """
@@ -177,8 +333,9 @@ class RecipeKnowledgeAgent:
                 }
                 
                 # Add directions from cache if available
-                if recipe_id in self.directions_cache:
-                    recipe['directions'] = self.directions_cache[recipe_id]
+                directions = self.directions_cache.get(recipe_id)
+                if directions:
+                    recipe['directions'] = directions
                 
                 # Use 'ingredients' field as 'ner' for compatibility
                 recipe['ner'] = recipe.get('ingredients', [])
@@ -228,8 +385,9 @@ class RecipeKnowledgeAgent:
                     }
                     
                     # Add directions from cache if available
-                    if rid in self.directions_cache:
-                        recipe['directions'] = self.directions_cache[rid]
+                    directions = self.directions_cache.get(rid)
+                    if directions:
+                        recipe['directions'] = directions
                     
                     # Use 'ingredients' field as 'ner' for compatibility
                     recipe['ner'] = recipe.get('ingredients', [])
@@ -310,7 +468,22 @@ class RecipeKnowledgeAgent:
         """Normalize ingredient names"""
         return [t for t in (_normalize_token(x) for x in items) if t]
 
-    def pantry_candidates(self, pantry_items: Iterable[str], allow_missing: int = 0, top_k: int = 200) -> List[Tuple[int, float, int, List[str]]]:
+    def pantry_token_set(self, items: Iterable[str]) -> FrozenSet[str]:
+        """
+        Normalize pantry items once into a frozenset of ingredient tokens.
+
+        Build this once per query (or per scenario) and pass it as `pantry_set`
+        so the per-recipe matching loop only does set intersections.
+        """
+        return frozenset(self.normalize_ingredients(items))
+
+    def pantry_candidates(
+        self,
+        pantry_items: Iterable[str],
+        allow_missing: int = 0,
+        top_k: int = 200,
+        pantry_set: Optional[FrozenSet[str]] = None
+    ) -> List[Tuple[int, float, int, List[str]]]:
         """
         LEFTOVR MODE: Find recipes using Pinecone metadata filtering
 
@@ -321,16 +494,21 @@ class RecipeKnowledgeAgent:
             pantry_items: Your available ingredients/leftovers
             allow_missing: 0 = only recipes you can make now, 1-2 = willing to shop
             top_k: Maximum results
+            pantry_set: Pre-normalized pantry tokens (see pantry_token_set);
+                        skips re-normalizing pantry_items when provided
 
         Returns:
             List of (recipe_id, score, num_pantry_used, missing_ingredients)
         """
-        if not self.pinecone_index:
-            print("⚠️  Pinecone not connected, cannot search recipes")
+        pantry = pantry_set if pantry_set is not None else self.pantry_token_set(pantry_items)
+        if not pantry:
             return []
 
-        pantry = set(self.normalize_ingredients(pantry_items))
-        if not pantry:
+        if self.recipe_ing_counts is not None:
+            return self._index_candidates(pantry, allow_missing, top_k)
+
+        if not self.pinecone_index:
+            print("⚠️  Pinecone not connected, cannot search recipes")
             return []
 
         try:
@@ -344,37 +522,43 @@ class RecipeKnowledgeAgent:
                 include_metadata=True
             )
 
-            # Score and filter results
-            scored_results = []
+            # Collect matching recipes as parallel arrays (struct-of-arrays)
+            rids: List[int] = []
+            recipe_sets: List[FrozenSet[str]] = []
+            used: List[int] = []
             for match in results.matches:
-                rid = int(match.id)
-                metadata = match.metadata
-                recipe_ingredients = set(metadata.get('ingredients', []))
+                recipe_ingredients = frozenset(match.metadata.get('ingredients', ()))
 
                 if not recipe_ingredients:
                     continue
 
                 # Calculate how many UNIQUE pantry items this recipe uses
                 num_pantry_used = len(pantry & recipe_ingredients)
-                
+
                 # Skip recipes that don't use any pantry items
                 if num_pantry_used == 0:
                     continue
 
-                # Calculate missing ingredients
-                missing = recipe_ingredients - pantry
-                num_missing = len(missing)
+                rids.append(int(match.id))
+                recipe_sets.append(recipe_ingredients)
+                used.append(num_pantry_used)
+
+            if not rids:
+                return []
+
+            n = len(rids)
+            num_used = np.fromiter(used, dtype=np.int32, count=n)
+            total_ing = np.fromiter((len(r) for r in recipe_sets), dtype=np.int32, count=n)
 
-                # Filter: only include if missing ingredients <= allowed
-                if num_missing <= allow_missing:
-                    # LEFTOVR SCORING: Number of UNIQUE pantry items used (more = better)
-                    # Bonus for recipes you can make now (0 missing)
-                    score = num_pantry_used * 100 + (1000 if num_missing == 0 else 0) - len(recipe_ingredients)
-                    scored_results.append((rid, float(score), num_pantry_used, list(missing)))
+            # LEFTOVR SCORING: Number of UNIQUE pantry items used (more = better)
+            # Bonus for recipes you can make now (0 missing); drops recipes
+            # missing more than allow_missing
+            top, scores = score_candidates(num_used, total_ing, allow_missing, top_k)
 
-            # Sort by score (descending)
-            scored_results.sort(key=lambda x: x[1], reverse=True)
-            return scored_results[:top_k]
+            return [
+                (rids[j], float(score), used[j], list(recipe_sets[j] - pantry))
+                for j, score in zip(top, scores)
+            ]
 
         except Exception as e:
             print(f"❌ Error in pantry_candidates: {e}")
@@ -382,12 +566,150 @@ class RecipeKnowledgeAgent:
             traceback.print_exc()
             return []
 
+    def _index_candidates(
+        self,
+        pantry: FrozenSet[str],
+        allow_missing: int,
+        top_k: int
+    ) -> List[Tuple[int, float, int, List[str]]]:
+        """
+        pantry_candidates() backed by the local inverted index.
+
+        Missing ingredient lists come from the index tokens the scores were
+        counted from. Recipes without metadata are dropped - checked against
+        the memory-mapped metadata when loaded, otherwise against Pinecone.
+        """
+        if isinstance(self.directions_cache, _LazyDirections):
+            known = self.directions_cache.has_record
+        elif self.pinecone_index:
+            known = None
+        else:
+            print("⚠️  Pinecone not connected, cannot search recipes")
+            return []
+
+        top_ids, scores, num_used = self._index_top(pantry, allow_missing, top_k)
+        if known is None:
+            known = self.get_recipes_by_ids(top_ids).__contains__
+
+        return [
+            (rid, float(score), int(used), self._index_missing(rid, pantry))
+            for rid, score, used in zip(top_ids, scores, num_used)
+            if known(rid)
+        ]
+
+    def _index_missing(self, rid: int, pantry: FrozenSet[str]) -> List[str]:
+        """Index tokens of a recipe that are not in the pantry."""
+        lo, hi = self._recipe_tok_start[rid], self._recipe_tok_start[rid + 1]
+        tokens = self._ing_tokens
+        return [tokens[t] for t in self._recipe_tok[lo:hi] if tokens[t] not in pantry]
+
+    def _index_top(
+        self,
+        pantry: FrozenSet[str],
+        allow_missing: int,
+        top_k: int
+    ) -> Tuple[List[int], np.ndarray, np.ndarray]:
+        """
+        Score recipes from the inverted index and keep the best top_k.
+
+        Concatenates the pantry's postings and counts hits per recipe with
+        bincount - no Python loop over recipes.
+
+        Returns:
+            (recipe_ids, scores, num_pantry_used) - best first
+        """
+        posts = [self.ing_index[t] for t in pantry if t in self.ing_index]
+        if not posts:
+            return [], np.empty(0), np.empty(0, dtype=np.intp)
+
+        total_ing = self.recipe_ing_counts
+        counts = np.bincount(np.concatenate(posts), minlength=len(total_ing))
+        cand = np.flatnonzero(counts)
+        num_used = counts[cand]
+
+        # Same LEFTOVR scoring + missing filter as the Pinecone scan
+        top, scores = score_candidates(num_used, total_ing[cand], allow_missing, top_k)
+        return [int(rid) for rid in cand[top]], scores, num_used[top]
+
+    def _exact_only(
+        self,
+        pantry: FrozenSet[str],
+        allow_missing: int,
+        top_k: int
+    ) -> List[Tuple[dict, float, int, List[str]]]:
+        """
+        hybrid_query() without semantic boosting, served entirely from local
+        data (inverted index + memory-mapped metadata) - no Pinecone calls.
+
+        Indexed recipes with no metadata record are skipped.
+        """
+        top_ids, scores, num_used = self._index_top(pantry, allow_missing, top_k)
+
+        results = []
+        for rid, score, used in zip(top_ids, scores, num_used):
+            meta = self.directions_cache.record(rid)
+            if meta is None:
+                continue
+            ingredients = meta.get('ingredients', meta.get('ner', []))
+            recipe = {
+                'id': rid,
+                'title': meta.get('title', 'Unknown'),
+                'ingredients': ingredients,
+                'source': meta.get('source', ''),
+                'link': meta.get('link', ''),
+                'ner': ingredients
+            }
+            if meta.get('directions'):
+                recipe['directions'] = meta['directions']
+            results.append((recipe, float(score), int(used), self._index_missing(rid, pantry)))
+        return results
+
+    @staticmethod
+    def semantic_query_text(
+        query: Optional[str] = None,
+        pantry_items: Optional[List[str]] = None
+    ) -> Optional[str]:
+        """
+        Build the text semantic_search() embeds for a query + pantry.
+
+        Returns None when there is nothing to embed.
+        """
+        query_parts = []
+        if query:
+            query_parts.append(query)
+        if pantry_items:
+            # Format like recipe embeddings: "Ingredients: chicken, garlic, lemon"
+            query_parts.append(f"Ingredients: {', '.join(pantry_items)}")
+        return ". ".join(query_parts) if query_parts else None
+
+    def encode_queries(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed many query texts in one batched forward pass.
+
+        Args:
+            texts: Query texts (see semantic_query_text)
+
+        Returns:
+            Array of shape (len(texts), embed_dim) with normalized embeddings
+        """
+        if self.embed_model is None:
+            print("⚠️  Embedding model not loaded, cannot encode queries")
+            return np.empty((0, self.embed_dim or 0), dtype=np.float32)
+
+        return self.embed_model.encode(
+            list(texts),
+            batch_size=32,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+
     def semantic_search(
         self,
         query: Optional[str] = None,
         pantry_items: Optional[List[str]] = None,
         k: int = 10,
-        filter_ingredients: Optional[List[str]] = None
+        filter_ingredients: Optional[List[str]] = None,
+        query_embedding: Optional[np.ndarray] = None
     ) -> List[Tuple[int, float]]:
         """
         Semantic search using Pinecone with all-MiniLM-L6-v2 embeddings
@@ -401,6 +723,8 @@ class RecipeKnowledgeAgent:
             pantry_items: Your ingredient list (e.g., ['chicken', 'garlic', 'lemon'])
             k: Number of results
             filter_ingredients: Optional list of required ingredients
+            query_embedding: Precomputed embedding of the query text
+                             (see encode_queries); skips the internal encode
 
         Note: You can provide query, pantry_items, or both!
               - query only: Find recipes matching description
@@ -412,23 +736,17 @@ class RecipeKnowledgeAgent:
         if self.pinecone_index is None or self.embed_model is None:
             return []
 
-        # Build query text from provided inputs
-        query_parts = []
-        if query:
-            query_parts.append(query)
-        if pantry_items:
-            # Format like recipe embeddings: "Ingredients: chicken, garlic, lemon"
-            query_parts.append(f"Ingredients: {', '.join(pantry_items)}")
-
-        if not query_parts:
-            print("⚠️  No query or pantry_items provided for semantic search")
-            return []
-
-        query_text = ". ".join(query_parts)
+        if query_embedding is None:
+            query_text = self.semantic_query_text(query, pantry_items)
+            if query_text is None:
+                print("⚠️  No query or pantry_items provided for semantic search")
+                return []
 
         try:
-            # Encode query using the same model (all-MiniLM-L6-v2)
-            query_vector = self.embed_model.encode(query_text, normalize_embeddings=True).tolist()
+            if query_embedding is None:
+                # Encode query using the same model (all-MiniLM-L6-v2)
+                query_embedding = self.embed_model.encode(query_text, normalize_embeddings=True)
+            query_vector = np.asarray(query_embedding, dtype=np.float32).tolist()
 
             # Build filter if needed
             pinecone_filter = None
@@ -460,7 +778,9 @@ class RecipeKnowledgeAgent:
         query_text: Optional[str] = None,
         top_k: int = 20,
         allow_missing: int = 0,
-        use_semantic: bool = True
+        use_semantic: bool = True,
+        pantry_set: Optional[FrozenSet[str]] = None,
+        query_embedding: Optional[np.ndarray] = None
     ) -> List[Tuple[dict, float, int, List[str]]]:
         """
         LEFTOVR HYBRID: Cloud-based recipe search using Pinecone
@@ -475,6 +795,11 @@ class RecipeKnowledgeAgent:
             top_k: Number of results to return
             allow_missing: How many ingredients you're willing to buy
             use_semantic: Whether to boost with semantic similarity
+            pantry_set: Pre-normalized pantry tokens (see pantry_token_set).
+                        Lets callers normalize a pantry once and reuse it.
+            query_embedding: Precomputed embedding of
+                             semantic_query_text(query_text, pantry_items),
+                             e.g. from a batched encode_queries() call
 
         Returns:
             List of (recipe_metadata, combined_score, num_pantry_used, missing_ingredients)
@@ -493,7 +818,7 @@ class RecipeKnowledgeAgent:
             3. Boost recipes semantically similar to your query + ingredients
         """
         # Auto-pull from pantry if not provided
-        if pantry_items is None:
+        if pantry_items is None and pantry_set is None:
             if self.pantry_agent:
                 print("📦 Recipe Knowledge Agent: Auto-loading pantry items...")
                 pantry_items = self.get_pantry_items()
@@ -501,15 +826,30 @@ class RecipeKnowledgeAgent:
                 print("⚠️ Recipe Knowledge Agent: No pantry items provided and no pantry agent connected")
                 pantry_items = []
 
-        pantry_list = list(pantry_items)
+        pantry_list = list(pantry_items) if pantry_items is not None else sorted(pantry_set)
+
+        # Normalize once - the matching loop only intersects frozensets
+        if pantry_set is None:
+            pantry_set = self.pantry_token_set(pantry_list)
+
+        # Exact-match only: score locally when the index and metadata are loaded
+        if (not use_semantic and self.recipe_ing_counts is not None
+                and isinstance(self.directions_cache, _LazyDirections)):
+            if not pantry_set:
+                return []
+            return self._exact_only(pantry_set, allow_missing, top_k)
 
         # Get leftover-optimized candidates from Pinecone
         pantry_cands = self.pantry_candidates(
             pantry_list,
             allow_missing=allow_missing,
-            top_k=500
+            top_k=500,
+            pantry_set=pantry_set
         )
 
+        if not pantry_cands:
+            return []
+
         # Get semantic matches if enabled
         sem_cands = []
         if use_semantic and self.pinecone_index and self.embed_model:
@@ -517,36 +857,60 @@ class RecipeKnowledgeAgent:
             sem_cands = self.semantic_search(
                 query=query_text,
                 pantry_items=pantry_list,
-                k=500
+                k=500,
+                query_embedding=query_embedding
             )
 
-        # Build combined scores
-        score_map: Dict[int, Tuple[float, int, List[str]]] = {}  # rid -> (score, num_used, missing)
-
-        # Start with leftover scores (already optimized)
-        for rid, leftover_score, num_used, missing in pantry_cands:
-            score_map[rid] = (leftover_score, num_used, missing)
+        # Combine scores as arrays aligned to the leftover candidates
+        rids = [rid for rid, _, _, _ in pantry_cands]
+        scores = np.fromiter((score for _, score, _, _ in pantry_cands), dtype=np.float64, count=len(rids))
 
         # Boost with semantic similarity if available
         if sem_cands:
-            for rid, sem_score in sem_cands:
-                if rid in score_map:
-                    current_score, num_used, missing = score_map[rid]
-                    # Add semantic bonus (scaled to be meaningful but not dominant)
-                    boosted_score = current_score + (sem_score * 50)
-                    score_map[rid] = (boosted_score, num_used, missing)
+            sem_scores = dict(sem_cands)
+            sem_sim = np.fromiter((sem_scores.get(rid, 0.0) for rid in rids), dtype=np.float64, count=len(rids))
+            # Add semantic bonus (scaled to be meaningful but not dominant)
+            scores += sem_sim * 50
 
         # Fetch recipe metadata from Pinecone for top results
-        ranked = sorted(score_map.items(), key=lambda x: x[1][0], reverse=True)[:top_k]
-        recipe_ids = [rid for rid, _ in ranked]
-        recipe_map = self.get_recipes_by_ids(recipe_ids)
+        top = top_k_indices(scores, top_k)
+        recipe_map = self.get_recipes_by_ids([rids[i] for i in top])
 
         # Return results with full metadata
         return [
-            (recipe_map.get(rid, {'id': rid, 'title': 'Unknown', 'ner': []}), float(score), num_used, missing)
-            for rid, (score, num_used, missing) in ranked
+            (recipe_map.get(rids[i], {'id': rids[i], 'title': 'Unknown', 'ner': []}),
+             float(scores[i]), pantry_cands[i][2], pantry_cands[i][3])
+            for i in top
         ]
 
+    async def hybrid_query_async(
+        self,
+        pantry_items: Optional[Iterable[str]] = None,
+        query_text: Optional[str] = None,
+        top_k: int = 20,
+        allow_missing: int = 0,
+        use_semantic: bool = True,
+        pantry_set: Optional[FrozenSet[str]] = None,
+        query_embedding: Optional[np.ndarray] = None
+    ) -> List[Tuple[dict, float, int, List[str]]]:
+        """
+        Async wrapper around hybrid_query() for issuing several searches
+        concurrently, e.g. with asyncio.gather().
+
+        The Pinecone and embedding calls are blocking, so the query runs in a
+        worker thread. Arguments are the same as hybrid_query().
+        """
+        return await asyncio.to_thread(
+            self.hybrid_query,
+            pantry_items=pantry_items,
+            query_text=query_text,
+            top_k=top_k,
+            allow_missing=allow_missing,
+            use_semantic=use_semantic,
+            pantry_set=pantry_set,
+            query_embedding=query_embedding
+        )
+
 
 if __name__ == '__main__':
     print('RecipeKnowledgeAgent - Pinecone based recipe retrieval')
@@ -51,6 +51,25 @@ class PantryDatabase:
                 VALUES (?, ?, ?, ?)
             ''', (id, name, quantity, expire_date))
             conn.commit()
+
+    def add_food_items(self, items):
+        """
+        Add many food items in one transaction.
+
+        `items` is an iterable of (id, name, quantity, expire_date) tuples.
+        Like add_food_item, quantities are added to any existing row.
+        """
+        with self.get_connection() as conn:
+            conn.executemany('''
+                INSERT INTO food_items (id, name, quantity, expire_date)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    name = excluded.name,
+                    quantity = food_items.quantity + excluded.quantity,
+                    expire_date = excluded.expire_date
+            ''', items)
+            conn.commit()
+
     # ------------------------------
     # READ
     # ------------------------------
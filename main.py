@@ -636,38 +636,32 @@ class LeftovrWorkflow:
 
     def _format_recommendations(self, top_3: List[Dict], expiring: List) -> str:
         """Format top 3 recommendations for user"""
-        response = "🍽️ **Here are my top 3 recipe recommendations:**\n\n"
+        blocks = ["🍽️ **Here are my top 3 recipe recommendations:**\n\n"]
 
         for i, recipe in enumerate(top_3, 1):
-            response += f"**{i}. {recipe.get('title', 'Unknown Recipe')}**\n"
-
-            # Show ingredient count
             ingredients = recipe.get('ner', []) or recipe.get('ingredients', [])
-            if ingredients:
-                response += f"   🥘 {len(ingredients)} ingredients\n"
-
-            # Show timing and servings
             ready_time = recipe.get('readyInMinutes', 'N/A')
             servings = recipe.get('servings', 'N/A')
-            if ready_time != 'N/A' or servings != 'N/A':
-                response += f"   ⏱️ {ready_time} min | 👥 {servings} servings\n"
-
-            # Show match percentage if available
             match_pct = recipe.get("match_percentage", recipe.get("score", 0))
-            if match_pct:
-                response += f"   🎯 {match_pct}% ingredient match\n"
+            reason = recipe.get("recommendation_reason", recipe.get("reasoning", "Great recipe!"))
 
-            # Show recipe link
             link = recipe.get('link', '')
-            if link:
-                # Make sure link has protocol
-                if not link.startswith('http'):
-                    link = f"https://{link}"
-                response += f"   🔗 [View Recipe]({link})\n"
+            # Make sure link has protocol
+            if link and not link.startswith('http'):
+                link = f"https://{link}"
+
+            # One block per recipe; optional lines collapse to ""
+            blocks.append(
+                f"**{i}. {recipe.get('title', 'Unknown Recipe')}**\n"
+                + (f"   🥘 {len(ingredients)} ingredients\n" if ingredients else "")
+                + (f"   ⏱️ {ready_time} min | 👥 {servings} servings\n"
+                   if ready_time != 'N/A' or servings != 'N/A' else "")
+                + (f"   🎯 {match_pct}% ingredient match\n" if match_pct else "")
+                + (f"   🔗 [View Recipe]({link})\n" if link else "")
+                + f"   💡 {reason}\n\n"
+            )
 
-            # Show why recommended
-            reason = recipe.get("recommendation_reason", recipe.get("reasoning", "Great recipe!"))
-            response += f"   💡 {reason}\n\n"
+        response = "".join(blocks)
 
         if expiring:
             expiring_names = [item.get('ingredient_name') or item.get('name', '') for item in expiring[:3]]
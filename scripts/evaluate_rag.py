@@ -37,6 +37,12 @@ except ImportError:
     print("❌ Error: Required packages not installed")
     sys.exit(1)
 
+# Optional faster JSON serializer for the results file
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class AdvancedRAGEvaluator:
     """Advanced RAG evaluation with graded relevance and user-centric metrics"""
@@ -453,8 +459,18 @@ class AdvancedRAGEvaluator:
     def save_results(self, output_path: str):
         """Save results"""
         print(f"\n💾 Saving to {output_path}...")
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(self.results, f, indent=2, default=str)
+        if orjson is not None:
+            # One bytes payload, one write
+            payload = orjson.dumps(
+                self.results,
+                default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            )
+            with open(output_path, 'wb') as f:
+                f.write(payload)
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(self.results, f, indent=2, default=str)
         print(f"   ✅ Saved")
 
 
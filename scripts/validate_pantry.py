@@ -75,10 +75,10 @@ def validate_via_mcp():
 
     if expiring:
         print(f"\n⚠️  EXPIRING SOON ({len(expiring)} items within 3 days):")
-        for item in expiring:
-            name = item.get('name', 'N/A')
-            expire = item.get('expire_date', 'N/A')
-            print(f"  • {name} - {expire}")
+        sys.stdout.write("".join(
+            f"  • {item.get('name', 'N/A')} - {item.get('expire_date', 'N/A')}\n"
+            for item in expiring
+        ))
     else:
         print("\n✅ No items expiring within 3 days")
 
@@ -17,6 +17,9 @@ YELLOW = '\033[93m'
 BLUE = '\033[94m'
 RESET = '\033[0m'
 
+# Header rule, built once
+SEP_EQ = '=' * 70
+
 def print_success(msg):
     print(f"{GREEN}✅ {msg}{RESET}")
 
@@ -30,9 +33,9 @@ def print_info(msg):
     print(f"{BLUE}ℹ️  {msg}{RESET}")
 
 def print_header(msg):
-    print(f"\n{'='*70}")
+    print(f"\n{SEP_EQ}")
     print(f"{BLUE}{msg}{RESET}")
-    print(f"{'='*70}\n")
+    print(f"{SEP_EQ}\n")
 
 
 # =============================================================================
@@ -344,9 +347,9 @@ def test_agent_workflow_direct():
 
 def main():
     """Run all tests"""
-    print(f"\n{'='*70}")
+    print(f"\n{SEP_EQ}")
     print(f"{BLUE}🧪 LEFTOVR APP - COMPLETE TEST SUITE{RESET}")
-    print(f"{'='*70}\n")
+    print(f"{SEP_EQ}\n")
     print(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
     
@@ -0,0 +1,25 @@
+"""Shared pytest fixtures for the LEFTOVR test suite."""
+
+import sys
+from pathlib import Path
+
+import pytest_asyncio
+
+# Make the repo root importable (agents/, database/) for every test module
+ROOT = str(Path(__file__).resolve().parent.parent)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def pantry_agent(tmp_path_factory):
+    """One connected PantryAgent per test session, on a throwaway database."""
+    from agents.pantry_agent import PantryAgent
+
+    # Never touch the developer's real ~/.leftovr/pantry.db
+    db_path = str(tmp_path_factory.mktemp("pantry") / "pantry.db")
+    agent = PantryAgent(name="Test Pantry Agent", db_path=db_path)
+    await agent.ensure_connected()
+    yield agent
+    agent.clear_pantry()
+    await agent.disconnect()
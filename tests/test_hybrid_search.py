@@ -10,8 +10,57 @@ It demonstrates:
   4. Full recipe details including DIRECTIONS (from metadata)
 """
 
+import asyncio
+import io
+import sys
+
 from agents.recipe_knowledge_agent import RecipeKnowledgeAgent
 
+# (pantry, query) inputs for the semantic tests, so every query can be
+# embedded up front in a single batched call
+TEST_CASES = {
+    "basic": (["chicken", "rice", "soy sauce"], None),
+    "preferences": (["ground beef", "tomatoes", "onion", "garlic"], "Italian comfort food"),
+    "zero_missing": (["eggs", "milk", "flour", "sugar", "butter"], "breakfast"),
+    "many_leftovers": ([
+        "chicken breast", "garlic", "olive oil", "lemon", "parsley",
+        "cherry tomatoes", "pasta", "parmesan", "butter", "white wine"
+    ], "Mediterranean dinner"),
+    "dietary": (["tofu", "quinoa", "kale", "tahini", "lemon juice"], "vegan protein bowl"),
+    "bonus": (["chicken", "garlic", "lemon"], "simple easy chicken"),
+}
+
+SCENARIOS = [
+    {
+        "name": "🌅 Quick Weeknight Dinner",
+        "pantry": ["chicken", "broccoli", "garlic", "ginger"],
+        "query": "quick 30 minute dinner",
+        "allow_missing": 3,
+        "top_k": 3
+    },
+    {
+        "name": "🎉 Weekend Cooking Project",
+        "pantry": ["beef", "red wine", "carrots", "thyme"],
+        "query": "slow cooked comfort food",
+        "allow_missing": 5,
+        "top_k": 3
+    },
+    {
+        "name": "🥗 Healthy Lunch Prep",
+        "pantry": ["spinach", "chickpeas", "feta", "cucumber"],
+        "query": "healthy salad",
+        "allow_missing": 2,
+        "top_k": 3
+    },
+    {
+        "name": "🍰 Dessert Craving",
+        "pantry": ["chocolate chips", "eggs", "vanilla"],
+        "query": "easy chocolate dessert",
+        "allow_missing": 4,
+        "top_k": 3
+    }
+]
+
 def print_separator(title="", char="="):
     if title:
         print(f"\n{char*80}")
@@ -20,61 +69,93 @@ def print_separator(title="", char="="):
     else:
         print(f"\n{char*80}\n")
 
-def print_recipe(idx, recipe, score, num_used, missing, show_directions=False):
-    """Pretty print a recipe result"""
+def print_recipe(idx, recipe, score, num_used, missing, show_directions=False, out=None):
+    """Pretty print a recipe result to `out` (defaults to stdout)"""
+    out = out if out is not None else sys.stdout
     title = recipe.get('title', 'Unknown')
-    ingredients = recipe.get('ner', [])
-    directions = recipe.get('directions', [])
+    ingredients = recipe.get('ner') or ()
+    directions = recipe.get('directions') or ()
+    n_missing, n_ing, n_dir = len(missing), len(ingredients), len(directions)
     
-    print(f"{idx}. [{score:.1f} pts] {title}")
-    print(f"   ✓ Uses {num_used} of your pantry items")
+    print(f"{idx}. [{score:.1f} pts] {title}", file=out)
+    print(f"   ✓ Uses {num_used} of your pantry items", file=out)
     
-    if missing:
-        print(f"   ⚠️  Missing {len(missing)} ingredient(s): {', '.join(missing[:3])}")
-        if len(missing) > 3:
-            print(f"      ... and {len(missing) - 3} more")
+    if n_missing:
+        print(f"   ⚠️  Missing {n_missing} ingredient(s): {', '.join(missing[:3])}", file=out)
+        if n_missing > 3:
+            print(f"      ... and {n_missing - 3} more", file=out)
     else:
-        print(f"   ✅ You can make this NOW (no shopping needed!)")
+        print(f"   ✅ You can make this NOW (no shopping needed!)", file=out)
     
-    if ingredients:
-        print(f"   📝 Ingredients: {', '.join(ingredients[:6])}")
-        if len(ingredients) > 6:
-            print(f"      ... and {len(ingredients) - 6} more ingredients")
+    if n_ing:
+        print(f"   📝 Ingredients: {', '.join(ingredients[:6])}", file=out)
+        if n_ing > 6:
+            print(f"      ... and {n_ing - 6} more ingredients", file=out)
     
-    if show_directions and directions:
-        print(f"   👨‍🍳 Directions ({len(directions)} steps):")
+    if show_directions and n_dir:
+        print(f"   👨‍🍳 Directions ({n_dir} steps):", file=out)
         for i, step in enumerate(directions[:3], 1):
             # Truncate long steps
             step_text = step[:100] + "..." if len(step) > 100 else step
-            print(f"      {i}. {step_text}")
-        if len(directions) > 3:
-            print(f"      ... and {len(directions) - 3} more steps")
-    print()
+            print(f"      {i}. {step_text}", file=out)
+        if n_dir > 3:
+            print(f"      ... and {n_dir - 3} more steps", file=out)
+    print(file=out)
 
 
-def main():
-    print_separator("🍳 LEFTOVR Hybrid Search - Production Test Suite")
-    
-    # Initialize agent
-    print("⚙️  Initializing RecipeKnowledgeAgent...")
+def create_agent():
+    """
+    Build a connected RecipeKnowledgeAgent with the optional local data loaded.
+
+    Setup helper for main(); the agent is created once and reused by every
+    scenario in the run.
+    """
     agent = RecipeKnowledgeAgent()
-    agent.setup_milvus()  # Connect to Milvus cloud - primary data source
+    agent.setup_pinecone()  # Pinecone cloud - primary data source
 
-    # Optional: Load directions from local file
+    # Optional: Load directions / ingredient index from local files
     try:
         agent.load_directions()
-        print(f"✅ Directions loaded for enhanced recipe details")
+        agent.load_ingredient_index()
     except Exception:
-        print(f"ℹ️  Directions not available (optional)")
+        print(f"ℹ️  Local recipe data not available (optional)")
 
-    if agent.milvus_client:
-        stats = agent.milvus_client.get_collection_stats(agent.collection_name)
-        recipe_count = stats.get('row_count', 'unknown')
-        print(f"✅ Ready! Connected to Milvus with {recipe_count} recipes")
+    return agent
+
+
+def main():
+    print_separator("🍳 LEFTOVR Hybrid Search - Production Test Suite")
+    
+    # Initialize agent
+    print("⚙️  Initializing RecipeKnowledgeAgent...")
+    agent = create_agent()
+
+    if agent.pinecone_index is not None:
+        print(f"✅ Ready! Connected to Pinecone index '{agent.index_name}'")
         print(f"✅ Vector search + ingredient filtering enabled\n")
     else:
-        print("❌ Failed to connect to Milvus. Please check your configuration.")
+        print("❌ Failed to connect to Pinecone. Please check your configuration.")
         return
+
+    # Embed every semantic query in one batched forward pass
+    semantic_inputs = list(TEST_CASES.values()) + [(s['pantry'], s['query']) for s in SCENARIOS]
+    texts = list(dict.fromkeys(agent.semantic_query_text(q, p) for p, q in semantic_inputs))
+    query_to_emb = dict(zip(texts, agent.encode_queries(texts)))
+    print(f"✅ Pre-embedded {len(query_to_emb)} queries in one batch\n")
+
+    def embedding_for(pantry, query):
+        return query_to_emb.get(agent.semantic_query_text(query, pantry))
+
+    def run_query(pantry_items, query_text=None, top_k=20, allow_missing=0, use_semantic=True):
+        return agent.hybrid_query(
+            pantry_items=pantry_items,
+            pantry_set=agent.pantry_token_set(pantry_items),
+            query_text=query_text,
+            top_k=top_k,
+            allow_missing=allow_missing,
+            use_semantic=use_semantic,
+            query_embedding=embedding_for(pantry_items, query_text) if use_semantic else None
+        )
     
     # ============================================================================
     # TEST 1: Basic Usage - Minimal Leftovers, No Preferences
@@ -83,21 +164,23 @@ def main():
     print("Scenario: User has basic leftovers, no specific preferences")
     print("Expected: Recipes that use the MOST items, even if missing some\n")
     
-    pantry = ["chicken", "rice", "soy sauce"]
+    pantry, query = TEST_CASES["basic"]
     
     print(f"🥘 Pantry Items: {', '.join(pantry)}\n")
     
-    results = agent.hybrid_query(
+    results = run_query(
         pantry_items=pantry,
-        query_text=None,  # No preferences!
+        query_text=query,  # No preferences!
         top_k=5,
         allow_missing=2,  # Willing to buy up to 2 items
         use_semantic=True
     )
     
     print(f"Found {len(results)} recipes:\n")
+    buf = io.StringIO()
     for i, (recipe, score, num_used, missing) in enumerate(results, 1):
-        print_recipe(i, recipe, score, num_used, missing)
+        print_recipe(i, recipe, score, num_used, missing, out=buf)
+    sys.stdout.write(buf.getvalue())
     
     # ============================================================================
     # TEST 2: With Preferences - Leftovers + Cooking Style
@@ -106,13 +189,12 @@ def main():
     print("Scenario: User has leftovers AND knows what they want to eat")
     print("Expected: Recipes matching BOTH ingredients AND preferences\n")
     
-    pantry = ["ground beef", "tomatoes", "onion", "garlic"]
-    query = "Italian comfort food"
+    pantry, query = TEST_CASES["preferences"]
     
     print(f"🥘 Pantry Items: {', '.join(pantry)}")
     print(f"🎯 User Preference: '{query}'\n")
     
-    results = agent.hybrid_query(
+    results = run_query(
         pantry_items=pantry,
         query_text=query,
         top_k=5,
@@ -121,8 +203,10 @@ def main():
     )
     
     print(f"Found {len(results)} recipes:\n")
+    buf = io.StringIO()
     for i, (recipe, score, num_used, missing) in enumerate(results, 1):
-        print_recipe(i, recipe, score, num_used, missing)
+        print_recipe(i, recipe, score, num_used, missing, out=buf)
+    sys.stdout.write(buf.getvalue())
     
     # ============================================================================
     # TEST 3: Zero Missing - Must Use Only Pantry Items
@@ -131,14 +215,13 @@ def main():
     print("Scenario: User doesn't want to buy ANYTHING")
     print("Expected: Only recipes using pantry items (zero missing)\n")
     
-    pantry = ["eggs", "milk", "flour", "sugar", "butter"]
-    query = "breakfast"
+    pantry, query = TEST_CASES["zero_missing"]
     
     print(f"🥘 Pantry Items: {', '.join(pantry)}")
     print(f"🎯 User Preference: '{query}'")
     print(f"🚫 Allow Missing: 0 (must use only pantry items!)\n")
     
-    results = agent.hybrid_query(
+    results = run_query(
         pantry_items=pantry,
         query_text=query,
         top_k=5,
@@ -148,8 +231,10 @@ def main():
     
     print(f"Found {len(results)} recipes:\n")
     if results:
+        buf = io.StringIO()
         for i, (recipe, score, num_used, missing) in enumerate(results, 1):
-            print_recipe(i, recipe, score, num_used, missing)
+            print_recipe(i, recipe, score, num_used, missing, out=buf)
+        sys.stdout.write(buf.getvalue())
     else:
         print("❌ No recipes found that use ONLY your pantry items")
         print("💡 Try increasing allow_missing to 1 or 2\n")
@@ -161,18 +246,14 @@ def main():
     print("Scenario: User has lots of leftovers, wants to use up as many as possible")
     print("Expected: Recipes ranked by number of items used (LEFTOVR philosophy)\n")
     
-    pantry = [
-        "chicken breast", "garlic", "olive oil", "lemon", "parsley",
-        "cherry tomatoes", "pasta", "parmesan", "butter", "white wine"
-    ]
-    query = "Mediterranean dinner"
+    pantry, query = TEST_CASES["many_leftovers"]
     
     print(f"🥘 Pantry Items ({len(pantry)} items):")
     for item in pantry:
         print(f"   • {item}")
     print(f"\n🎯 User Preference: '{query}'\n")
     
-    results = agent.hybrid_query(
+    results = run_query(
         pantry_items=pantry,
         query_text=query,
         top_k=10,
@@ -181,8 +262,10 @@ def main():
     )
     
     print(f"Found {len(results)} recipes:\n")
+    buf = io.StringIO()
     for i, (recipe, score, num_used, missing) in enumerate(results, 1):
-        print_recipe(i, recipe, score, num_used, missing)
+        print_recipe(i, recipe, score, num_used, missing, out=buf)
+    sys.stdout.write(buf.getvalue())
     
     # ============================================================================
     # TEST 5: Dietary Restrictions / Specific Ingredients
@@ -191,13 +274,12 @@ def main():
     print("Scenario: User has specific dietary needs (e.g., vegan, gluten-free)")
     print("Expected: Recipes that respect dietary restrictions\n")
     
-    pantry = ["tofu", "quinoa", "kale", "tahini", "lemon juice"]
-    query = "vegan protein bowl"
+    pantry, query = TEST_CASES["dietary"]
     
     print(f"🥘 Pantry Items: {', '.join(pantry)}")
     print(f"🎯 User Preference: '{query}'\n")
     
-    results = agent.hybrid_query(
+    results = run_query(
         pantry_items=pantry,
         query_text=query,
         top_k=5,
@@ -206,8 +288,10 @@ def main():
     )
     
     print(f"Found {len(results)} recipes:\n")
+    buf = io.StringIO()
     for i, (recipe, score, num_used, missing) in enumerate(results, 1):
-        print_recipe(i, recipe, score, num_used, missing)
+        print_recipe(i, recipe, score, num_used, missing, out=buf)
+    sys.stdout.write(buf.getvalue())
     
     # ============================================================================
     # TEST 6: Without Semantic Search (Fallback Mode)
@@ -220,7 +304,7 @@ def main():
     
     print(f"🥘 Pantry Items: {', '.join(pantry)}\n")
     
-    results = agent.hybrid_query(
+    results = run_query(
         pantry_items=pantry,
         query_text=None,
         top_k=5,
@@ -229,66 +313,45 @@ def main():
     )
     
     print(f"Found {len(results)} recipes (exact match only):\n")
+    buf = io.StringIO()
     for i, (recipe, score, num_used, missing) in enumerate(results, 1):
-        print_recipe(i, recipe, score, num_used, missing)
+        print_recipe(i, recipe, score, num_used, missing, out=buf)
+    sys.stdout.write(buf.getvalue())
     
     # ============================================================================
     # TEST 7: Real-World Scenarios
     # ============================================================================
     print_separator("TEST 7: Real-World Usage Scenarios", "-")
     
-    scenarios = [
-        {
-            "name": "🌅 Quick Weeknight Dinner",
-            "pantry": ["chicken", "broccoli", "garlic", "ginger"],
-            "query": "quick 30 minute dinner",
-            "allow_missing": 3,
-            "top_k": 3
-        },
-        {
-            "name": "🎉 Weekend Cooking Project",
-            "pantry": ["beef", "red wine", "carrots", "thyme"],
-            "query": "slow cooked comfort food",
-            "allow_missing": 5,
-            "top_k": 3
-        },
-        {
-            "name": "🥗 Healthy Lunch Prep",
-            "pantry": ["spinach", "chickpeas", "feta", "cucumber"],
-            "query": "healthy salad",
-            "allow_missing": 2,
-            "top_k": 3
-        },
-        {
-            "name": "🍰 Dessert Craving",
-            "pantry": ["chocolate chips", "eggs", "vanilla"],
-            "query": "easy chocolate dessert",
-            "allow_missing": 4,
-            "top_k": 3
-        }
-    ]
-    
-    for scenario in scenarios:
-        print(f"\n{scenario['name']}")
-        print(f"Pantry: {', '.join(scenario['pantry'])}")
-        print(f"Looking for: {scenario['query']}\n")
-        
-        results = agent.hybrid_query(
-            pantry_items=scenario['pantry'],
-            query_text=scenario['query'],
-            top_k=scenario['top_k'],
-            allow_missing=scenario['allow_missing'],
-            use_semantic=True
-        )
+    # Scenarios are independent - run their searches concurrently
+    async def run_scenarios():
+        return await asyncio.gather(*(
+            agent.hybrid_query_async(
+                pantry_items=scenario['pantry'],
+                query_text=scenario['query'],
+                top_k=scenario['top_k'],
+                allow_missing=scenario['allow_missing'],
+                use_semantic=True,
+                query_embedding=embedding_for(scenario['pantry'], scenario['query'])
+            )
+            for scenario in SCENARIOS
+        ))
+    
+    for scenario, results in zip(SCENARIOS, asyncio.run(run_scenarios())):
+        buf = io.StringIO()
+        print(f"\n{scenario['name']}", file=buf)
+        print(f"Pantry: {', '.join(scenario['pantry'])}", file=buf)
+        print(f"Looking for: {scenario['query']}\n", file=buf)
         
         if results:
             for i, (recipe, score, num_used, missing) in enumerate(results, 1):
                 title = recipe.get('title', 'Unknown')
-                print(f"   {i}. [{score:.0f} pts] {title}")
-                print(f"      Uses {num_used} items | Missing: {len(missing)}")
+                print(f"   {i}. [{score:.0f} pts] {title}", file=buf)
+                print(f"      Uses {num_used} items | Missing: {len(missing)}", file=buf)
         else:
-            print("   No results found")
-        print()
+            print("   No results found", file=buf)
+        print(file=buf)
+        sys.stdout.write(buf.getvalue())
     
     # ============================================================================
     # Summary
@@ -377,56 +440,60 @@ Return Format:
     print("Demonstrating that directions can be loaded from local file")
     print("even though they're NOT stored in Milvus (keeps vectors lightweight)\n")
     
-    pantry = ["chicken", "garlic", "lemon"]
+    pantry, query = TEST_CASES["bonus"]
     print(f"🥘 Pantry: {', '.join(pantry)}")
     print(f"🎯 Looking for: simple chicken recipe\n")
     
-    results = agent.hybrid_query(
+    results = run_query(
         pantry_items=pantry,
-        query_text="simple easy chicken",
+        query_text=query,
         top_k=2,
         allow_missing=2
     )
     
     for i, (recipe, score, num_used, missing) in enumerate(results, 1):
-        print(f"\n{'='*80}")
-        print(f"  RECIPE {i}: {recipe.get('title', 'Unknown')}")
-        print(f"{'='*80}")
+        buf = io.StringIO()
+        print(f"\n{'='*80}", file=buf)
+        print(f"  RECIPE {i}: {recipe.get('title', 'Unknown')}", file=buf)
+        print(f"{'='*80}", file=buf)
         
-        print(f"\n💯 LEFTOVR Score: {score:.0f} points")
-        print(f"✓ Uses {num_used} of your pantry items")
+        print(f"\n💯 LEFTOVR Score: {score:.0f} points", file=buf)
+        print(f"✓ Uses {num_used} of your pantry items", file=buf)
         if missing:
-            print(f"⚠️  Missing: {', '.join(missing)}")
+            print(f"⚠️  Missing: {', '.join(missing)}", file=buf)
         else:
-            print(f"✅ You have everything!")
+            print(f"✅ You have everything!", file=buf)
         
         # Ingredients
-        ingredients = recipe.get('ner', [])
-        if ingredients:
-            print(f"\n📝 INGREDIENTS ({len(ingredients)} total):")
+        ingredients = recipe.get('ner') or ()
+        n_ing = len(ingredients)
+        if n_ing:
+            print(f"\n📝 INGREDIENTS ({n_ing} total):", file=buf)
             for ing in ingredients[:10]:
-                print(f"   • {ing}")
-            if len(ingredients) > 10:
-                print(f"   ... and {len(ingredients) - 10} more")
+                print(f"   • {ing}", file=buf)
+            if n_ing > 10:
+                print(f"   ... and {n_ing - 10} more", file=buf)
         
         # Directions - Available from metadata!
-        directions = recipe.get('directions', [])
-        if directions:
-            print(f"\n👨‍🍳 COOKING DIRECTIONS ({len(directions)} steps):")
+        directions = recipe.get('directions') or ()
+        n_dir = len(directions)
+        if n_dir:
+            print(f"\n👨‍🍳 COOKING DIRECTIONS ({n_dir} steps):", file=buf)
             for j, step in enumerate(directions[:5], 1):
                 step_text = step[:100] + "..." if len(step) > 100 else step
-                print(f"   {j}. {step_text}")
-            if len(directions) > 5:
-                print(f"   ... and {len(directions) - 5} more steps")
+                print(f"   {j}. {step_text}", file=buf)
+            if n_dir > 5:
+                print(f"   ... and {n_dir - 5} more steps", file=buf)
         else:
-            print(f"\n👨‍🍳 COOKING DIRECTIONS: Not available for this recipe")
+            print(f"\n👨‍🍳 COOKING DIRECTIONS: Not available for this recipe", file=buf)
         
         # Source
-        print(f"\n🔗 Source: {recipe.get('source', 'Unknown')}")
+        print(f"\n🔗 Source: {recipe.get('source', 'Unknown')}", file=buf)
         if recipe.get('link'):
-            print(f"🌐 Link: {recipe.get('link')}")
+            print(f"🌐 Link: {recipe.get('link')}", file=buf)
         
-        print(f"\n{'='*80}")
+        print(f"\n{'='*80}", file=buf)
+        sys.stdout.write(buf.getvalue())
 
 if __name__ == "__main__":
     main()
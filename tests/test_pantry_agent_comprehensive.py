@@ -10,22 +10,44 @@ Tests all features including:
 - Food validation
 - Multi-item operations
 - Expiring items
+
+Runs on uvloop when it is installed (optional: pip install uvloop).
+Pass --workers N to run every test in its own process against a
+throwaway pantry database.
 """
 
+import argparse
 import asyncio
+import contextlib
+import io
+import os
 import sys
-from pathlib import Path
+import tempfile
+import traceback
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Any
 from datetime import datetime, timedelta
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from agents.pantry_agent import PantryAgent
+# Typed response model lives with the MCP agent; the direct-DB agent returns dicts
+from agents.pantry_agent_mcp_backup import PantryItemsResponse
+
+# Expire-date format stored by PantryDatabase
+EXPIRE_FMT = "%Y-%m-%d"
 
-from agents.pantry_agent import PantryAgent, PantryItemsResponse
+# (query, filler word that must never show up as a pending item,
+#  real items of which at least one should be pending when clarification is asked)
+EDGE_FILLER_CASES = [
+    ("I have mango and sticky rice as well", "well", ("mango", "sticky rice")),
+    ("I have tomatoes and eggs too", "too", ()),
+    ("I got chicken also", "also", ()),
+]
 
 
 class TestResult:
     """Container for test results"""
+    __slots__ = ("name", "passed", "details")
+
     def __init__(self, name: str, passed: bool, details: str = ""):
         self.name = name
         self.passed = passed
@@ -39,33 +61,100 @@ class TestResult:
 class PantryAgentTester:
     """Comprehensive test suite for PantryAgent"""
 
-    def __init__(self):
+    # Number of add_result() calls in a full run (6+5+5+2+2+1+1+4)
+    EXPECTED_TESTS = 26
+
+    def __init__(self, db_path: str = None, verbose: bool = None):
+        self.db_path = db_path
+        # Section banners are noise in CI logs; show them only interactively
+        self.verbose = not os.environ.get("CI") if verbose is None else verbose
         self.agent = None
-        self.results: List[TestResult] = []
+        # Preallocated result slots; self.results exposes the filled part
+        self._results: List[TestResult] = [None] * self.EXPECTED_TESTS
+        self._idx = 0
+        self._dirty = False  # pantry modified since the last clear
+        self._log: List[str] = []  # result lines awaiting _flush_log()
+        self.failed_count = 0  # set by print_summary()
 
     async def setup(self):
         """Setup test environment"""
         print("🔧 Setting up test environment...")
-        self.agent = PantryAgent(name="Test Pantry Agent")
-        await self.agent.ensure_connected()
+        # PantryAgent opens its database on first use; no explicit connect
+        self.agent = PantryAgent(name="Test Pantry Agent", db_path=self.db_path)
 
         # Clear pantry before tests
-        await self.agent._clear_pantry_async()
+        self.agent.clear_pantry()
+        self._dirty = False
         print("✅ Test environment ready\n")
 
     async def teardown(self):
         """Cleanup test environment"""
+        # Emit any results still buffered (e.g. when a test raised mid-section)
+        self._flush_log()
         print("\n🧹 Cleaning up test environment...")
         if self.agent:
-            await self.agent._clear_pantry_async()
+            self.agent.clear_pantry()
             await self.agent.disconnect()
         print("✅ Cleanup complete")
 
     def add_result(self, name: str, passed: bool, details: str = ""):
         """Add a test result"""
-        result = TestResult(name, passed, details)
-        self.results.append(result)
-        print(result)
+        self._record(TestResult(name, passed, details))
+
+    def _record(self, result: TestResult):
+        """Store a result; its line is printed on the next _flush_log()"""
+        if self._idx < len(self._results):
+            self._results[self._idx] = result
+        else:
+            self._results.append(result)
+        self._idx += 1
+        self._log.append(str(result))
+
+    @property
+    def results(self) -> List[TestResult]:
+        """Results recorded so far, in order"""
+        return self._results[:self._idx]
+
+    def _section(self, title: str):
+        """Flush the previous section's results and print the next banner"""
+        self._flush_log()
+        if self.verbose:
+            print("\n" + "=" * 70)
+            print(title)
+            print("=" * 70)
+
+    def _flush_log(self):
+        """Write buffered result lines in one call (once per section)"""
+        if self._log:
+            sys.stdout.write("\n".join(self._log) + "\n")
+            sys.stdout.flush()
+            self._log.clear()
+
+    def _add(self, ingredient_name: str, quantity: int, **kwargs):
+        """add_or_update_ingredient() that marks the pantry dirty"""
+        self._dirty = True
+        return self.agent.add_or_update_ingredient(ingredient_name, quantity, **kwargs)
+
+    def _add_many(self, rows):
+        """bulk_add_ingredients() (one transaction) that marks the pantry dirty"""
+        self._dirty = True
+        return self.agent.bulk_add_ingredients(rows)
+
+    @staticmethod
+    def _by_name(inventory: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Index an inventory list by item name for O(1) lookups"""
+        return {item["name"]: item for item in inventory}
+
+    async def _query(self, message: str):
+        """handle_query() that marks the pantry dirty (queries may add/remove items)"""
+        self._dirty = True
+        return await self.agent.handle_query(message)
+
+    async def _clear_if_dirty(self):
+        """Clear the pantry only if something was added since the last clear"""
+        if self._dirty:
+            self.agent.clear_pantry()
+            self._dirty = False
 
     # ============================================
     # BASIC OPERATIONS TESTS
@@ -73,7 +162,7 @@ class PantryAgentTester:
 
     async def test_basic_add_ingredient(self):
         """Test basic ingredient addition"""
-        result = self.agent.add_or_update_ingredient("apple", 5)
+        result = self._add("apple", 5)
 
         passed = (
             result.get("success") == True and
@@ -89,8 +178,7 @@ class PantryAgentTester:
     async def test_get_inventory(self):
         """Test getting inventory"""
         # Add some items first
-        self.agent.add_or_update_ingredient("banana", 3)
-        self.agent.add_or_update_ingredient("orange", 2)
+        self._add_many([("banana", 3), ("orange", 2)])
 
         inventory = self.agent.get_inventory()
 
@@ -105,7 +193,7 @@ class PantryAgentTester:
     async def test_remove_ingredient(self):
         """Test removing an ingredient"""
         # Add item first
-        self.agent.add_or_update_ingredient("mango", 3)
+        self._add("mango", 3)
 
         # Remove it
         result = self.agent.remove_ingredient("mango")
@@ -121,7 +209,7 @@ class PantryAgentTester:
     async def test_update_quantity_absolute(self):
         """Test updating quantity (absolute mode)"""
         # Add item first
-        self.agent.add_or_update_ingredient("tomato", 5)
+        self._add("tomato", 5)
 
         # Update to exact quantity
         result = self.agent.update_quantity("tomato", 10, mode="absolute")
@@ -140,7 +228,7 @@ class PantryAgentTester:
     async def test_update_quantity_delta(self):
         """Test updating quantity (delta mode)"""
         # Add item first
-        self.agent.add_or_update_ingredient("potato", 10)
+        self._add("potato", 10)
 
         # Subtract 3
         result = self.agent.update_quantity("potato", -3, mode="delta")
@@ -159,15 +247,14 @@ class PantryAgentTester:
     async def test_clear_pantry(self):
         """Test clearing entire pantry"""
         # Clear pantry first to ensure clean state
-        await self.agent._clear_pantry_async()
+        await self._clear_if_dirty()
 
         # Add multiple items
-        self.agent.add_or_update_ingredient("item1", 1)
-        self.agent.add_or_update_ingredient("item2", 2)
-        self.agent.add_or_update_ingredient("item3", 3)
+        self._add_many([("item1", 1), ("item2", 2), ("item3", 3)])
 
         # Clear all
         deleted = self.agent.clear_pantry()
+        self._dirty = False
 
         # Check inventory is empty
         inventory = self.agent.get_inventory()
@@ -186,12 +273,12 @@ class PantryAgentTester:
 
     async def test_nl_explicit_quantity(self):
         """Test: 'I have 5 apples' (explicit quantity)"""
-        result = await self.agent.handle_query("I have 5 apples")
+        result = await self._query("I have 5 apples")
 
         passed = (
             isinstance(result, PantryItemsResponse) and
             len(result.items) > 0 and
-            not result.__dict__.get("needs_clarification", False)
+            not getattr(result, "needs_clarification", False)
         )
 
         self.add_result(
@@ -202,12 +289,12 @@ class PantryAgentTester:
 
     async def test_nl_article_a_an(self):
         """Test: 'I have a tomato' (with article = quantity 1)"""
-        result = await self.agent.handle_query("I have a tomato")
+        result = await self._query("I have a tomato")
 
         passed = (
             isinstance(result, PantryItemsResponse) and
             len(result.items) > 0 and
-            not result.__dict__.get("needs_clarification", False)
+            not getattr(result, "needs_clarification", False)
         )
 
         self.add_result(
@@ -218,7 +305,7 @@ class PantryAgentTester:
 
     async def test_nl_plural_without_quantity(self):
         """Test: 'I have oysters' (plural without quantity - needs clarification)"""
-        result = await self.agent.handle_query("I have oysters")
+        result = await self._query("I have oysters")
 
         # Should ask for clarification
         needs_clarification = (
@@ -238,7 +325,7 @@ class PantryAgentTester:
 
     async def test_nl_singular_without_article(self):
         """Test: 'I have garlic' (singular without article - ambiguous)"""
-        result = await self.agent.handle_query("I have garlic")
+        result = await self._query("I have garlic")
 
         # Should ask for clarification
         needs_clarification = (
@@ -257,7 +344,7 @@ class PantryAgentTester:
 
     async def test_nl_uncountable_noun(self):
         """Test: 'I have milk' (uncountable - needs clarification)"""
-        result = await self.agent.handle_query("I have milk")
+        result = await self._query("I have milk")
 
         # Should ask for clarification
         needs_clarification = (
@@ -278,83 +365,31 @@ class PantryAgentTester:
     # EDGE CASE TESTS (The Important Ones!)
     # ============================================
 
-    async def test_edge_as_well(self):
-        """Test: 'I have mango and sticky rice as well' (the bug we fixed!)"""
-        result = await self.agent.handle_query("I have mango and sticky rice as well")
-
-        # Should ask for clarification for both items
-        needs_clarification = isinstance(result, dict) and result.get("needs_clarification") == True
-
-        if needs_clarification:
-            pending = result.get("pending_items", [])
-            # Check that "well" is NOT in the list
-            has_well_bug = "well" in pending
-            has_correct_items = "mango" in pending or "sticky rice" in pending
-
-            passed = not has_well_bug and has_correct_items
-            details = f"Pending items: {pending}, has 'well' bug: {has_well_bug}"
-        else:
-            passed = isinstance(result, PantryItemsResponse)
-            details = f"Result type: {type(result).__name__}"
-
-        self.add_result(
-            "Edge Case: 'as well'",
-            passed,
-            details
-        )
-
-        # Clear pending state
-        self.agent.pending_items = []
-
-    async def test_edge_too(self):
-        """Test: 'I have tomatoes and eggs too'"""
-        result = await self.agent.handle_query("I have tomatoes and eggs too")
+    async def test_edge_filler_words(self):
+        """Test: filler words ('as well', 'too', 'also') never become pending items"""
+        for query, filler, expected_items in EDGE_FILLER_CASES:
+            result = await self._query(query)
 
-        # Should handle "too" correctly
-        if isinstance(result, dict) and result.get("needs_clarification"):
-            pending = result.get("pending_items", [])
-            has_too_bug = "too" in pending
-            passed = not has_too_bug
-            details = f"Pending items: {pending}, has 'too' bug: {has_too_bug}"
-        else:
-            passed = True
-            details = "Handled correctly without clarification issues"
+            if isinstance(result, dict) and result.get("needs_clarification"):
+                pending = set(result.get("pending_items", []))
+                has_filler_bug = filler in pending
+                has_correct_items = not expected_items or any(i in pending for i in expected_items)
 
-        self.add_result(
-            "Edge Case: 'too'",
-            passed,
-            details
-        )
+                passed = not has_filler_bug and has_correct_items
+                details = f"Pending items: {sorted(pending)}, has '{filler}' bug: {has_filler_bug}"
+            else:
+                # Without clarification the real items must have been added
+                passed = not expected_items or isinstance(result, PantryItemsResponse)
+                details = f"Result type: {type(result).__name__}"
 
-        # Clear pending state
-        self.agent.pending_items = []
+            self.add_result(f"Edge Case: '{query}'", passed, details)
 
-    async def test_edge_also(self):
-        """Test: 'I got chicken also'"""
-        result = await self.agent.handle_query("I got chicken also")
-
-        # Should handle "also" correctly
-        if isinstance(result, dict) and result.get("needs_clarification"):
-            pending = result.get("pending_items", [])
-            has_also_bug = "also" in pending
-            passed = not has_also_bug
-            details = f"Pending items: {pending}, has 'also' bug: {has_also_bug}"
-        else:
-            passed = True
-            details = "Handled correctly"
-
-        self.add_result(
-            "Edge Case: 'also'",
-            passed,
-            details
-        )
-
-        # Clear pending state
-        self.agent.pending_items = []
+            # Clear pending state
+            self.agent.pending_items = []
 
     async def test_edge_compound_items(self):
         """Test: Compound food names like 'sticky rice', 'ice cream'"""
-        result = await self.agent.handle_query("I have 2 sticky rice and 3 ice cream")
+        result = await self._query("I have 2 sticky rice and 3 ice cream")
 
         passed = isinstance(result, PantryItemsResponse) and len(result.items) >= 1
 
@@ -366,7 +401,7 @@ class PantryAgentTester:
 
     async def test_edge_mixed_quantities(self):
         """Test: Mixed - some with quantities, some without"""
-        result = await self.agent.handle_query("I have 2 apples and bananas")
+        result = await self._query("I have 2 apples and bananas")
 
         # Should handle mixed case (2 apples explicit, bananas needs clarification)
         # The LLM should either add apples and ask about bananas, or ask about both
@@ -387,7 +422,7 @@ class PantryAgentTester:
 
     async def test_food_validation_reject_nonfood(self):
         """Test: Reject non-food items like 'laptop'"""
-        result = await self.agent.handle_query("I have a laptop")
+        result = await self._query("I have a laptop")
 
         # Should reject non-food item - either explicit error OR no items added
         is_error = isinstance(result, dict) and "error" in result
@@ -402,7 +437,7 @@ class PantryAgentTester:
 
     async def test_food_validation_accept_food(self):
         """Test: Accept valid food items"""
-        result = await self.agent.handle_query("I have a chicken")
+        result = await self._query("I have a chicken")
 
         # Should accept food item
         passed = isinstance(result, PantryItemsResponse) or (
@@ -424,7 +459,7 @@ class PantryAgentTester:
 
     async def test_multi_item_explicit_quantities(self):
         """Test: 'I bought 2 apples, 3 bananas, and 5 oranges'"""
-        result = await self.agent.handle_query("I bought 2 apples, 3 bananas, and 5 oranges")
+        result = await self._query("I bought 2 apples, 3 bananas, and 5 oranges")
 
         passed = isinstance(result, PantryItemsResponse) and len(result.items) == 3
 
@@ -437,18 +472,17 @@ class PantryAgentTester:
     async def test_multi_item_removal(self):
         """Test: 'I ate 2 apples and 1 banana'"""
         # Clear pantry first for clean state
-        await self.agent._clear_pantry_async()
+        await self._clear_if_dirty()
 
         # Add items first
-        self.agent.add_or_update_ingredient("apple", 10)
-        self.agent.add_or_update_ingredient("banana", 10)
+        self._add_many([("apple", 10), ("banana", 10)])
 
-        result = await self.agent.handle_query("I ate 2 apples and 1 banana")
+        result = await self._query("I ate 2 apples and 1 banana")
 
         # Check updated quantities
-        inventory = self.agent.get_inventory()
-        apple_qty = next((item["quantity"] for item in inventory if item["name"] == "apple"), None)
-        banana_qty = next((item["quantity"] for item in inventory if item["name"] == "banana"), None)
+        by_name = self._by_name(self.agent.get_inventory())
+        apple_qty = by_name.get("apple", {}).get("quantity")
+        banana_qty = by_name.get("banana", {}).get("quantity")
 
         passed = apple_qty == 8 and banana_qty == 9
 
@@ -465,7 +499,7 @@ class PantryAgentTester:
     async def test_quantity_clarification_flow(self):
         """Test: Full clarification flow"""
         # Step 1: User says "I have oysters"
-        result1 = await self.agent.handle_query("I have oysters")
+        result1 = await self._query("I have oysters")
 
         needs_clarification = (
             isinstance(result1, dict) and
@@ -482,7 +516,7 @@ class PantryAgentTester:
             return
 
         # Step 2: User responds with "5"
-        result2 = await self.agent.handle_query("5")
+        result2 = await self._query("5")
 
         added = isinstance(result2, PantryItemsResponse) and len(result2.items) > 0
 
@@ -511,19 +545,22 @@ class PantryAgentTester:
 
     async def test_expiring_soon(self):
         """Test: Get items expiring soon"""
+        today = datetime.now().date()
+
         # Add item that expires in 3 days
-        expire_date = (datetime.now() + timedelta(days=3)).strftime("%Y-%m-%d")
-        self.agent.add_or_update_ingredient("expiring-item", 1, expire_date=expire_date)
+        expire_date = (today + timedelta(days=3)).strftime(EXPIRE_FMT)
+        self._add("expiring-item", 1, expire_date=expire_date)
 
         # Add item that expires in 30 days
-        expire_date_far = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
-        self.agent.add_or_update_ingredient("fresh-item", 1, expire_date=expire_date_far)
+        expire_date_far = (today + timedelta(days=30)).strftime(EXPIRE_FMT)
+        self._add("fresh-item", 1, expire_date=expire_date_far)
 
         # Get items expiring within 7 days
         expiring = self.agent.get_expiring_soon(days_threshold=7)
 
         # Should only get the item expiring in 3 days
-        passed = len(expiring) == 1 and expiring[0]["name"] == "expiring-item"
+        by_name = {item["name"].lower(): item for item in expiring}
+        passed = len(expiring) == 1 and "expiring-item" in by_name
 
         self.add_result(
             "Get Expiring Soon",
@@ -537,12 +574,11 @@ class PantryAgentTester:
 
     async def test_operation_ate(self):
         """Test: 'I ate 2 eggs'"""
-        self.agent.add_or_update_ingredient("egg", 10)
+        self._add("egg", 10)
 
-        result = await self.agent.handle_query("I ate 2 eggs")
+        result = await self._query("I ate 2 eggs")
 
-        inventory = self.agent.get_inventory()
-        egg_qty = next((item["quantity"] for item in inventory if item["name"] == "egg"), None)
+        egg_qty = self._by_name(self.agent.get_inventory()).get("egg", {}).get("quantity")
 
         passed = egg_qty == 8
 
@@ -554,9 +590,9 @@ class PantryAgentTester:
 
     async def test_operation_remove(self):
         """Test: 'Remove tomato' (complete removal)"""
-        self.agent.add_or_update_ingredient("tomato", 5)
+        self._add("tomato", 5)
 
-        result = await self.agent.handle_query("Remove tomato")
+        result = await self._query("Remove tomato")
 
         inventory = self.agent.get_inventory()
         has_tomato = any(item["name"] == "tomato" for item in inventory)
@@ -572,10 +608,9 @@ class PantryAgentTester:
     async def test_operation_clear_all(self):
         """Test: 'Clear pantry'"""
         # Add some items
-        self.agent.add_or_update_ingredient("item1", 1)
-        self.agent.add_or_update_ingredient("item2", 2)
+        self._add_many([("item1", 1), ("item2", 2)])
 
-        result = await self.agent.handle_query("Clear the pantry")
+        result = await self._query("Clear the pantry")
 
         inventory = self.agent.get_inventory()
 
@@ -590,10 +625,9 @@ class PantryAgentTester:
     async def test_operation_view_inventory(self):
         """Test: 'What's in my pantry?'"""
         # Add some items
-        self.agent.add_or_update_ingredient("apple", 3)
-        self.agent.add_or_update_ingredient("banana", 2)
+        self._add_many([("apple", 3), ("banana", 2)])
 
-        result = await self.agent.handle_query("What's in my pantry?")
+        result = await self._query("What's in my pantry?")
 
         passed = isinstance(result, PantryItemsResponse) and len(result.items) >= 2
 
@@ -609,17 +643,16 @@ class PantryAgentTester:
 
     async def run_all_tests(self):
         """Run all tests"""
-        print("=" * 70)
-        print("🧪 COMPREHENSIVE PANTRY AGENT TEST SUITE")
-        print("=" * 70)
-        print()
+        if self.verbose:
+            print("=" * 70)
+            print("🧪 COMPREHENSIVE PANTRY AGENT TEST SUITE")
+            print("=" * 70)
+            print()
 
         await self.setup()
 
         # Basic Operations
-        print("\n" + "=" * 70)
-        print("📦 BASIC OPERATIONS TESTS")
-        print("=" * 70)
+        self._section("📦 BASIC OPERATIONS TESTS")
         await self.test_basic_add_ingredient()
         await self.test_get_inventory()
         await self.test_remove_ingredient()
@@ -628,9 +661,7 @@ class PantryAgentTester:
         await self.test_clear_pantry()
 
         # Natural Language Queries
-        print("\n" + "=" * 70)
-        print("🗣️  NATURAL LANGUAGE QUERY TESTS")
-        print("=" * 70)
+        self._section("🗣️  NATURAL LANGUAGE QUERY TESTS")
         await self.test_nl_explicit_quantity()
         await self.test_nl_article_a_an()
         await self.test_nl_plural_without_quantity()
@@ -638,45 +669,31 @@ class PantryAgentTester:
         await self.test_nl_uncountable_noun()
 
         # Edge Cases (THE IMPORTANT ONES!)
-        print("\n" + "=" * 70)
-        print("🔥 EDGE CASE TESTS (Critical!)")
-        print("=" * 70)
-        await self.test_edge_as_well()
-        await self.test_edge_too()
-        await self.test_edge_also()
+        self._section("🔥 EDGE CASE TESTS (Critical!)")
+        await self.test_edge_filler_words()
         await self.test_edge_compound_items()
         await self.test_edge_mixed_quantities()
 
         # Food Validation
-        print("\n" + "=" * 70)
-        print("🍽️  FOOD VALIDATION TESTS")
-        print("=" * 70)
+        self._section("🍽️  FOOD VALIDATION TESTS")
         await self.test_food_validation_reject_nonfood()
         await self.test_food_validation_accept_food()
 
         # Multi-Item Operations
-        print("\n" + "=" * 70)
-        print("📚 MULTI-ITEM OPERATION TESTS")
-        print("=" * 70)
+        self._section("📚 MULTI-ITEM OPERATION TESTS")
         await self.test_multi_item_explicit_quantities()
         await self.test_multi_item_removal()
 
         # Quantity Clarification Flow
-        print("\n" + "=" * 70)
-        print("💬 QUANTITY CLARIFICATION FLOW TESTS")
-        print("=" * 70)
+        self._section("💬 QUANTITY CLARIFICATION FLOW TESTS")
         await self.test_quantity_clarification_flow()
 
         # Expiring Items
-        print("\n" + "=" * 70)
-        print("⏰ EXPIRING ITEMS TESTS")
-        print("=" * 70)
+        self._section("⏰ EXPIRING ITEMS TESTS")
         await self.test_expiring_soon()
 
         # Operation-Specific
-        print("\n" + "=" * 70)
-        print("⚙️  OPERATION-SPECIFIC TESTS")
-        print("=" * 70)
+        self._section("⚙️  OPERATION-SPECIFIC TESTS")
         await self.test_operation_ate()
         await self.test_operation_remove()
         await self.test_operation_clear_all()
@@ -687,15 +704,39 @@ class PantryAgentTester:
         # Print summary
         self.print_summary()
 
+    def run_all_tests_in_workers(self, workers: int):
+        """Run every test in a process pool, each against its own database"""
+        if self.verbose:
+            print("=" * 70)
+            print(f"🧪 COMPREHENSIVE PANTRY AGENT TEST SUITE ({workers} workers)")
+            print("=" * 70)
+            print()
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for results in pool.map(_run_test_in_worker, ALL_TESTS):
+                for result in results:
+                    self._record(result)
+
+        self.print_summary()
+
     def print_summary(self):
         """Print test summary"""
+        self._flush_log()
         print("\n" + "=" * 70)
         print("📊 TEST SUMMARY")
         print("=" * 70)
 
-        total = len(self.results)
-        passed = sum(1 for r in self.results if r.passed)
-        failed = total - passed
+        # One pass: tally passes and collect failures together
+        passed = 0
+        failed_results = []
+        for result in self.results:
+            if result.passed:
+                passed += 1
+            else:
+                failed_results.append(result)
+        failed = len(failed_results)
+        total = passed + failed
+        self.failed_count = failed  # reused by main() for the exit code
 
         print(f"\nTotal Tests: {total}")
         print(f"✅ Passed: {passed}")
@@ -704,11 +745,10 @@ class PantryAgentTester:
 
         if failed > 0:
             print("\n❌ Failed Tests:")
-            for result in self.results:
-                if not result.passed:
-                    print(f"   - {result.name}")
-                    if result.details:
-                        print(f"     {result.details}")
+            for result in failed_results:
+                print(f"   - {result.name}")
+                if result.details:
+                    print(f"     {result.details}")
 
         print("\n" + "=" * 70)
 
@@ -720,29 +760,67 @@ class PantryAgentTester:
         print("=" * 70)
 
 
+# Test methods in definition order
+ALL_TESTS = [name for name in vars(PantryAgentTester) if name.startswith("test_")]
+
+
+def _run_test_in_worker(test_name: str) -> List[TestResult]:
+    """Run one test with a fresh agent and throwaway pantry (worker process)"""
+    async def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            tester = PantryAgentTester(db_path=os.path.join(tmp, "pantry.db"))
+            await tester.setup()
+            try:
+                await getattr(tester, test_name)()
+            except Exception:
+                # Report the crash as a failure instead of losing it with the worker's stdout
+                tester.add_result(test_name, False, traceback.format_exc())
+            finally:
+                await tester.teardown()
+            return tester.results
+
+    # Setup/teardown chatter stays in the worker; results are printed by the parent
+    with contextlib.redirect_stdout(io.StringIO()):
+        return asyncio.run(run())
+
+
 async def main():
     """Main test runner"""
+    parser = argparse.ArgumentParser(description="Comprehensive PantryAgent tests")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Run tests in N processes, each with its own pantry database")
+    args = parser.parse_args()
+
     tester = PantryAgentTester()
 
     try:
-        await tester.run_all_tests()
+        if args.workers > 1:
+            tester.run_all_tests_in_workers(args.workers)
+        else:
+            await tester.run_all_tests()
 
         # Exit with appropriate code
-        failed = sum(1 for r in tester.results if not r.passed)
+        failed = tester.failed_count
         sys.exit(0 if failed == 0 else 1)
 
     except KeyboardInterrupt:
+        tester._flush_log()
         print("\n\n⚠️  Tests interrupted by user")
         await tester.teardown()
         sys.exit(130)
     except Exception as e:
+        tester._flush_log()
         print(f"\n\n❌ Test suite failed with error: {str(e)}")
-        import traceback
         traceback.print_exc()
         await tester.teardown()
         sys.exit(1)
 
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
     asyncio.run(main())
 
@@ -0,0 +1,64 @@
+"""
+Tests for the bulk (UPSERT) add path used by PantryAgent.handle_query.
+
+Run with: python -m pytest tests/test_pantry_storage.py
+"""
+
+import pytest
+
+from database.pantry_storage import PantryDatabase
+
+
+def test_add_food_items_adds_quantity_on_conflict(tmp_path):
+    """add_food_items sums quantities on an existing id, like add_food_item"""
+    db = PantryDatabase(str(tmp_path / "pantry.db"))
+    db.add_food_item("apple", "apple", 2, "2030-01-01")
+
+    db.add_food_items([
+        ("apple", "apple", 3, "2030-02-01"),
+        ("banana", "banana", 4, "2030-01-15"),
+    ])
+
+    apple = db.get_food_item_by_id("apple")
+    assert apple["quantity"] == 5
+    assert apple["expire_date"] == "2030-02-01"
+    assert db.get_food_item_by_id("banana")["quantity"] == 4
+
+
+def test_add_food_items_matches_add_food_item(tmp_path):
+    """The bulk path and the single-item path end in the same state"""
+    single = PantryDatabase(str(tmp_path / "single.db"))
+    bulk = PantryDatabase(str(tmp_path / "bulk.db"))
+    rows = [("egg", "egg", 6, "2030-01-01"), ("egg", "egg", 4, "2030-01-01")]
+
+    for row in rows:
+        single.add_food_item(*row)
+    bulk.add_food_items(rows)
+
+    assert bulk.get_all_food_items() == single.get_all_food_items()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_bulk_add_ingredients_adds_quantity_on_conflict(pantry_agent):
+    """bulk_add_ingredients normalizes ids and adds to existing quantities"""
+    pantry_agent.clear_pantry()
+    pantry_agent.add_or_update_ingredient("tomato", 2)
+
+    added = pantry_agent.bulk_add_ingredients([("tomatoes", 3), ("rice", 1, "2030-01-01")])
+
+    assert [item["id"] for item in added] == ["tomato", "rice"]
+    inventory = {item["id"]: item for item in pantry_agent.get_inventory()}
+    assert inventory["tomato"]["quantity"] == 5
+    assert inventory["rice"]["expire_date"] == "2030-01-01"
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_handle_query_adds_through_bulk_path(pantry_agent):
+    """'Add 2 eggs, 3 milk' lands in the pantry in one call"""
+    pantry_agent.clear_pantry()
+
+    result = await pantry_agent.handle_query("Add 2 eggs, 3 milk")
+
+    assert [(item["name"], item["quantity"]) for item in result["items"]] == [("eggs", 2), ("milk", 3)]
+    inventory = {item["id"]: item["quantity"] for item in pantry_agent.get_inventory()}
+    assert inventory == {"egg": 2, "milk": 3}
@@ -0,0 +1,124 @@
+"""
+Tests for the local-data paths of agents/recipe_knowledge_agent.py
+(memory-mapped directions + inverted ingredient index). No Pinecone needed.
+
+Run with: python -m pytest tests/test_recipe_knowledge_agent.py
+"""
+
+import json
+
+import pytest
+
+from agents.recipe_knowledge_agent import RecipeKnowledgeAgent, _LazyDirections
+
+
+# One line per directions shape the loader has to handle: non-empty, empty,
+# null and missing, plus lines whose "id" is not the first key and blank lines
+METADATA_LINES = [
+    '{"id": 1, "title": "Egg Fried Rice", "ingredients": ["egg", "rice"], "directions": ["Fry the rice.", "Add the egg."]}',
+    '',
+    '{"title": "Rice Bowl", "id": 2, "ingredients": ["rice"], "directions": []}',
+    '{"id": 3, "title": "Egg Toast", "ingredients": ["egg", "bread"], "directions": null}',
+    '{"id": 4, "title": "Plain Rice", "ingredients": ["rice"]}',
+    '{"title": "Omelette", "id": 5, "ingredients": ["egg", "cheese"], "directions": ["Whisk.", "Cook."]}',
+    '   ',
+]
+
+# Recipe 6 is indexed but has no metadata line
+INGREDIENT_INDEX = {
+    "egg": [1, 3, 5, 6],
+    "rice": [1, 2, 4],
+    "bread": [3],
+    "cheese": [5],
+    "salt": [6],
+}
+
+
+def eager_directions(path):
+    """The dict load_directions() used to build before it was memory-mapped"""
+    cache = {}
+    with open(path, 'r', encoding='utf8') as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            obj = json.loads(line)
+            directions = obj.get('directions', [])
+            if directions:
+                cache[int(obj['id'])] = directions
+    return cache
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    (tmp_path / "recipe_metadata.jsonl").write_text("\n".join(METADATA_LINES) + "\n", encoding="utf8")
+    (tmp_path / "ingredient_index.json").write_text(json.dumps(INGREDIENT_INDEX), encoding="utf8")
+    return tmp_path
+
+
+@pytest.fixture
+def agent(data_dir):
+    agent = RecipeKnowledgeAgent(data_dir=str(data_dir))
+    agent.load_directions()
+    agent.load_ingredient_index()
+    return agent
+
+
+def test_lazy_directions_match_eager_dict(data_dir):
+    """Same keys and directions as the eager loader"""
+    path = data_dir / "recipe_metadata.jsonl"
+    cache = _LazyDirections.from_file(str(path))
+
+    assert dict(cache) == eager_directions(path) == {
+        1: ["Fry the rice.", "Add the egg."],
+        5: ["Whisk.", "Cook."],
+    }
+    assert 2 not in cache and 3 not in cache and 4 not in cache
+    assert cache.get(3) is None
+
+
+def test_lazy_directions_record_reaches_every_line(data_dir):
+    """record() returns lines without directions too, and None for unknown ids"""
+    cache = _LazyDirections.from_file(str(data_dir / "recipe_metadata.jsonl"))
+
+    assert cache.record(2)["title"] == "Rice Bowl"
+    assert cache.record(4)["title"] == "Plain Rice"
+    assert cache.has_record(4)
+    assert cache.record(6) is None
+    assert not cache.has_record(6)
+
+
+def test_pantry_candidates_from_index(agent):
+    """Missing lists come from the index; ids without metadata are dropped"""
+    cands = agent.pantry_candidates(["eggs", "rice"], allow_missing=1, top_k=10)
+    by_id = {rid: (used, sorted(missing)) for rid, _, used, missing in cands}
+
+    assert by_id == {
+        1: (2, []),
+        2: (1, []),
+        3: (1, ["bread"]),
+        4: (1, []),
+        5: (1, ["cheese"]),
+    }
+    # Using more leftovers ranks first
+    assert cands[0][0] == 1
+
+
+def test_hybrid_query_exact_only_uses_local_metadata(agent):
+    """use_semantic=False is served from the index + metadata file"""
+    results = agent.hybrid_query(["eggs", "rice"], top_k=10, allow_missing=1, use_semantic=False)
+    by_id = {recipe['id']: (recipe, missing) for recipe, _, _, missing in results}
+
+    assert set(by_id) == {1, 2, 3, 4, 5}
+    assert by_id[1][0]['title'] == "Egg Fried Rice"
+    assert by_id[1][0]['directions'] == ["Fry the rice.", "Add the egg."]
+    assert 'directions' not in by_id[3][0]
+    assert by_id[3][1] == ["bread"]
+    assert by_id[5][1] == ["cheese"]
+
+
+def test_hybrid_query_exact_only_respects_allow_missing(agent):
+    """allow_missing=0 keeps only recipes that can be made now"""
+    results = agent.hybrid_query(["eggs", "rice"], top_k=10, allow_missing=0, use_semantic=False)
+
+    assert {recipe['id'] for recipe, _, _, _ in results} == {1, 2, 4}
+    assert all(missing == [] for _, _, _, missing in results)
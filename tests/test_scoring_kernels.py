@@ -0,0 +1,68 @@
+"""
+Tests for agents/_scoring_kernels.py.
+
+Run with: python -m pytest tests/test_scoring_kernels.py
+"""
+
+import numpy as np
+import pytest
+
+from agents._scoring_kernels import score_candidates, top_k_indices
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_top_k_indices_matches_stable_sort(seed):
+    """Same ids, same order as a full stable sort - ties included"""
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 60))
+    # LEFTOVR scores are small integers, so ties are the common case
+    scores = rng.integers(0, 5, size=n).astype(np.float64)
+    k = int(rng.integers(0, n + 3))
+
+    expected = np.argsort(-scores, kind='stable')[:max(k, 0)]
+    np.testing.assert_array_equal(top_k_indices(scores, k), expected)
+
+
+def test_score_candidates_drops_too_many_missing():
+    """Candidates missing more than allow_missing never come back"""
+    num_used = np.array([3, 2, 1, 3])
+    total_ing = np.array([3, 5, 2, 4])
+
+    idx, scores = score_candidates(num_used, total_ing, allow_missing=1, top_k=10)
+
+    # 0: 300 + 1000 - 3, 3: 300 - 4, 2: 100 - 2; 1 is missing 3
+    np.testing.assert_array_equal(idx, [0, 3, 2])
+    np.testing.assert_array_equal(scores, [1297.0, 296.0, 98.0])
+
+
+def test_numba_kernel_matches_numpy_fallback():
+    """The JIT loop and the NumPy fallback agree, rejections included"""
+    pytest.importorskip("numba")
+    from agents._scoring_kernels import _score, _score_numpy
+
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        n = int(rng.integers(1, 500))
+        num_used = rng.integers(0, 10, n).astype(np.int32)
+        total_ing = (num_used + rng.integers(0, 5, n)).astype(np.int32)
+        sem_sim = rng.random(n)
+
+        jit = _score(num_used, total_ing, sem_sim, 2)
+        ref = _score_numpy(num_used, total_ing, sem_sim, 2)
+
+        np.testing.assert_array_equal(np.isinf(jit), np.isinf(ref))
+        np.testing.assert_allclose(jit[~np.isinf(jit)], ref[~np.isinf(ref)])
+
+
+def test_numba_kernel_is_safe_from_threads():
+    """hybrid_query_async scores from worker threads; the kernel must tolerate it"""
+    pytest.importorskip("numba")
+    from concurrent.futures import ThreadPoolExecutor
+
+    num_used = np.array([3, 2, 1, 3])
+    total_ing = np.array([3, 5, 2, 4])
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(
+            lambda _: score_candidates(num_used, total_ing, 1, 10)[0].tolist(), range(64)
+        ))
+    assert all(r == [0, 3, 2] for r in results)